@@ -7,7 +7,10 @@ from __future__ import annotations
 
 import asyncio
 import logging
-from decimal import Decimal
+import time
+from collections.abc import Awaitable, Callable, Mapping
+from types import MappingProxyType
+from typing import TypeVar
 
 from aleph.sdk import AlephHttpClient, AuthenticatedAlephHttpClient
 from aleph.sdk.client.services.pricing import PricingEntity
@@ -26,15 +29,17 @@ from .types import CrnInfo
 
 logger = logging.getLogger(__name__)
 
+T = TypeVar("T")
+
 # Map friendly names to rootfs hashes
-OS_IMAGE_MAP: dict[str, str] = {
+OS_IMAGE_MAP: Mapping[str, str] = MappingProxyType({
     "ubuntu22": sdk_settings.UBUNTU_22_QEMU_ROOTFS_ID,
     "ubuntu24": sdk_settings.UBUNTU_24_QEMU_ROOTFS_ID,
     "debian12": sdk_settings.DEBIAN_12_QEMU_ROOTFS_ID,
-}
+})
 
 # Compute-unit tiers: units → (vcpus, memory_mib, disk_mib)
-CU_TIERS: dict[int, tuple[int, int, int]] = {
+CU_TIERS: Mapping[int, tuple[int, int, int]] = MappingProxyType({
     1: (1, 2048, 20_480),
     2: (2, 4096, 40_960),
     3: (3, 6144, 61_440),
@@ -42,28 +47,137 @@ CU_TIERS: dict[int, tuple[int, int, int]] = {
     6: (6, 12_288, 122_880),
     8: (8, 16_384, 163_840),
     12: (12, 24_576, 245_760),
-}
+})
+
+# CU_TIERS flattened into a tuple indexed by unit count (None = invalid tier)
+_CU_TIER_TABLE: tuple[tuple[int, int, int] | None, ...] = tuple(
+    CU_TIERS.get(units) for units in range(max(CU_TIERS) + 1)
+)
 
 
 def _resolve_tier(compute_units: int) -> tuple[int, int, int]:
     """Return (vcpus, memory_mib, disk_mib) for a compute-unit count."""
-    if compute_units in CU_TIERS:
-        return CU_TIERS[compute_units]
+    # Integral floats (2.0) are accepted, as the old CU_TIERS lookup did
+    if isinstance(compute_units, float) and compute_units.is_integer():
+        compute_units = int(compute_units)
+    if isinstance(compute_units, int) and 0 <= compute_units < len(_CU_TIER_TABLE):
+        tier = _CU_TIER_TABLE[compute_units]
+        if tier is not None:
+            return tier
     raise ValueError(
         f"Invalid compute_units={compute_units}. "
         f"Valid: {sorted(CU_TIERS.keys())}"
     )
 
 
+# ---------------------------------------------------------------------------
+# Shared clients
+# ---------------------------------------------------------------------------
+
+# One HTTP session for the process lifetime instead of a TCP+TLS handshake
+# per call. Authenticated clients are keyed by signing address.
+_shared_client: AlephHttpClient | None = None
+_auth_clients: dict[str, AuthenticatedAlephHttpClient] = {}
+_client_lock = asyncio.Lock()
+
+
+async def _get_client() -> AlephHttpClient:
+    global _shared_client
+    if _shared_client is not None:
+        return _shared_client
+    async with _client_lock:
+        if _shared_client is None:
+            _shared_client = await AlephHttpClient().__aenter__()
+        return _shared_client
+
+
+async def _get_auth_client(account) -> AuthenticatedAlephHttpClient:
+    key = account.get_address()
+    client = _auth_clients.get(key)
+    if client is not None:
+        return client
+    async with _client_lock:
+        client = _auth_clients.get(key)
+        if client is None:
+            client = await AuthenticatedAlephHttpClient(account=account).__aenter__()
+            _auth_clients[key] = client
+        return client
+
+
+async def close_clients() -> None:
+    """Close every shared client. Called on server shutdown.
+
+    Also replaces the lock, which stays bound to the event loop it was
+    contended in.
+    """
+    global _shared_client, _client_lock
+    clients: list = list(_auth_clients.values())
+    if _shared_client is not None:
+        clients.append(_shared_client)
+    _shared_client = None
+    _auth_clients.clear()
+    _client_lock = asyncio.Lock()
+    for client in clients:
+        try:
+            await client.__aexit__(None, None, None)
+        except Exception as e:
+            logger.debug("Error closing Aleph client: %s", e)
+
+
 # ---------------------------------------------------------------------------
 # Balance
 # ---------------------------------------------------------------------------
 
 
+async def _single_flight(
+    cache: dict[str, tuple[float, asyncio.Future]],
+    key: str,
+    ttl: float,
+    fetch: Callable[[], Awaitable[T]],
+) -> T:
+    """Return a keyed cached result, sharing one in-flight fetch per key.
+
+    The fetch task is stored before the first await, so concurrent callers
+    for the same key latch onto a single request. Failures are not cached.
+    """
+    entry = cache.get(key)
+    if entry is None or time.monotonic() >= entry[0]:
+        entry = (time.monotonic() + ttl, asyncio.ensure_future(fetch()))
+        cache[key] = entry
+    try:
+        return await asyncio.shield(entry[1])
+    except Exception:
+        if cache.get(key) is entry:
+            del cache[key]
+        raise
+
+
+# Safety checks read the balance several times per tool call; keep it briefly.
+BALANCE_TTL_SECONDS: float = 5.0
+
+# address → (expires_at, in-flight or completed fetch)
+_BALANCE_CACHE: dict[str, tuple[float, asyncio.Future[float]]] = {}
+
+
+def invalidate_balance(address: str | None = None) -> None:
+    """Drop the cached balance for address, or every cached balance if None."""
+    if address is None:
+        _BALANCE_CACHE.clear()
+    else:
+        _BALANCE_CACHE.pop(address, None)
+
+
+async def _fetch_balance(address: str) -> float:
+    client = await _get_client()
+    balance = await client.get_balances(address)
+    return float(balance.credit_balance)
+
+
 async def get_balance(address: str) -> float:
-    async with AlephHttpClient() as client:
-        balance = await client.get_balances(address)
-        return float(balance.credit_balance)
+    """Credit balance for address, cached per address for BALANCE_TTL_SECONDS."""
+    return await _single_flight(
+        _BALANCE_CACHE, address, BALANCE_TTL_SECONDS, lambda: _fetch_balance(address)
+    )
 
 
 # ---------------------------------------------------------------------------
@@ -71,11 +185,45 @@ async def get_balance(address: str) -> float:
 # ---------------------------------------------------------------------------
 
 
+# Pricing changes rarely; share one fetch across back-to-back safety checks.
+PRICING_TTL_SECONDS: float = 60.0
+
+_PRICING_CACHE: tuple[float, float] | None = None  # (expires_at, credit_per_cu_hour)
+_pricing_lock = asyncio.Lock()
+
+
+def invalidate_pricing_cache() -> None:
+    # Fresh lock too: a contended asyncio.Lock stays bound to its event loop
+    global _PRICING_CACHE, _pricing_lock
+    _PRICING_CACHE = None
+    _pricing_lock = asyncio.Lock()
+
+
+async def _fetch_credit_per_cu_hour() -> float:
+    # The SDK only exposes the whole aggregate (no entity filter), so read the
+    # one price we need and let the aggregate go out of scope immediately.
+    client = await _get_client()
+    pricing = await client.pricing.get_pricing_aggregate()
+    return float(pricing[PricingEntity.INSTANCE].price["compute_unit"].credit)
+
+
 async def get_credit_per_cu_hour() -> float:
-    async with AlephHttpClient() as client:
-        pricing = await client.pricing.get_pricing_aggregate()
-        instance_pricing = pricing[PricingEntity.INSTANCE]
-        return float(instance_pricing.price["compute_unit"].credit)
+    """Credits per compute unit per hour, cached for PRICING_TTL_SECONDS.
+
+    Concurrent misses wait on a lock and re-check, so they share one fetch.
+    """
+    global _PRICING_CACHE
+    cached = _PRICING_CACHE
+    if cached is not None and time.monotonic() < cached[0]:
+        return cached[1]
+
+    async with _pricing_lock:
+        cached = _PRICING_CACHE
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
+        value = await _fetch_credit_per_cu_hour()
+        _PRICING_CACHE = (time.monotonic() + PRICING_TTL_SECONDS, value)
+        return value
 
 
 # ---------------------------------------------------------------------------
@@ -83,41 +231,95 @@ async def get_credit_per_cu_hour() -> float:
 # ---------------------------------------------------------------------------
 
 
+# The network CRN list is large and changes slowly; fetch it once per TTL
+# and serve both list_crns and find_crn from memory.
+CRN_TTL_SECONDS: float = 60.0
+
+# Free (vcpus, memory_mib, disk_mib) reported by a CRN; None if it reports none.
+_Capacity = tuple[int, int, int] | None
+
+# (expires_at, (CrnInfo, capacity) in network order, hash → CrnInfo)
+_CRN_CACHE: tuple[float, list[tuple[CrnInfo, _Capacity]], dict[str, CrnInfo]] | None = None
+_crn_lock = asyncio.Lock()
+
+
+def invalidate_crn_cache() -> None:
+    # Fresh lock too: a contended asyncio.Lock stays bound to its event loop
+    global _CRN_CACHE, _crn_lock
+    _CRN_CACHE = None
+    _crn_lock = asyncio.Lock()
+
+
+async def _get_crns() -> tuple[list[tuple[CrnInfo, _Capacity]], dict[str, CrnInfo]]:
+    global _CRN_CACHE
+    cached = _CRN_CACHE
+    if cached is not None and time.monotonic() < cached[0]:
+        return cached[1], cached[2]
+
+    async with _crn_lock:
+        cached = _CRN_CACHE
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1], cached[2]
+        client = await _get_client()
+        crn_list = await client.crn.get_crns_list(only_active=True)
+        to_info, capacity = _crn_to_info, _crn_capacity
+        entries = [(to_info(crn), capacity(crn)) for crn in crn_list.crns]
+        index: dict[str, CrnInfo] = {}
+        for info, _ in entries:
+            index.setdefault(info.hash, info)
+        _CRN_CACHE = (time.monotonic() + CRN_TTL_SECONDS, entries, index)
+        return entries, index
+
+
 async def list_crns(
     min_compute_units: int = 1,
     gpu: bool = False,
 ) -> list[CrnInfo]:
-    vcpus, memory, disk = _resolve_tier(min_compute_units)
-    async with AlephHttpClient() as client:
-        crn_list = await client.crn.get_crns_list(only_active=True)
-
-    results = []
-    for crn in crn_list.crns:
-        results.append(_crn_to_info(crn))
+    """Active CRNs that can host min_compute_units (and have a GPU, if asked).
 
-    return results
+    CRNs that don't report system usage are kept, since their capacity is unknown.
+    """
+    vcpus, memory, disk = _resolve_tier(min_compute_units)
+    entries, _ = await _get_crns()
+    return [
+        info
+        for info, cap in entries
+        if (not gpu or info.has_gpu)
+        and (cap is None or (cap[0] >= vcpus and cap[1] >= memory and cap[2] >= disk))
+    ]
+
+
+def _crn_capacity(crn) -> _Capacity:
+    usage = getattr(crn, "system_usage", None)
+    if usage is None:
+        return None
+    return (
+        usage.cpu.count,
+        usage.mem.available_kB // 1024,
+        usage.disk.available_kB // 1024,
+    )
 
 
 def _crn_to_info(crn) -> CrnInfo:
-    """Convert an SDK CRN object to our CrnInfo dataclass."""
+    """Convert an SDK CRN object to our CrnInfo dataclass.
+
+    version and gpu_support are declared fields on the SDK model, so they
+    are read directly; terms_and_conditions is an extra field and may be absent.
+    """
     return CrnInfo(
         hash=crn.hash,
         name=crn.name or "",
         url=crn.address,  # 'address' is the URL, per SDK gotcha
         score=0.0,  # not available from SDK CRN object
-        version=getattr(crn, "version", None),
-        has_gpu=bool(getattr(crn, "gpu_support", False)),
+        version=crn.version,
+        has_gpu=bool(crn.gpu_support),
         terms_and_conditions=getattr(crn, "terms_and_conditions", None),
     )
 
 
 async def find_crn(crn_hash: str) -> CrnInfo | None:
-    async with AlephHttpClient() as client:
-        crn_list = await client.crn.get_crns_list(only_active=True)
-        crn = crn_list.find_crn(crn_hash=crn_hash)
-        if crn is None:
-            return None
-        return _crn_to_info(crn)
+    _, index = await _get_crns()
+    return index.get(crn_hash)
 
 
 # ---------------------------------------------------------------------------
@@ -154,30 +356,33 @@ async def create_instance(
         node_req.terms_and_conditions = ItemHash(terms_and_conditions)
     requirements = HostRequirements(node=node_req)
 
-    async with AuthenticatedAlephHttpClient(account=account) as client:
-        message, status = await client.create_instance(
-            rootfs=rootfs,
-            rootfs_size=disk,
-            payment=payment,
-            memory=memory,
-            vcpus=vcpus,
-            ssh_keys=[ssh_pubkey],
-            metadata={"name": name},
-            hypervisor=HypervisorType.qemu,
-            requirements=requirements,
-            address=payer_address,
-            channel=sdk_settings.DEFAULT_CHANNEL,
-            storage_engine=StorageEnum.storage,
-            sync=True,
-        )
-
-        item_hash = str(message.item_hash)
-
-        # Set up port forwarding for SSH
-        await client.port_forwarder.create_ports(
-            item_hash=message.item_hash,
-            ports=Ports(root={22: PortFlags(tcp=True, udp=False)}),
-        )
+    client = await _get_auth_client(account)
+    message, status = await client.create_instance(
+        rootfs=rootfs,
+        rootfs_size=disk,
+        payment=payment,
+        memory=memory,
+        vcpus=vcpus,
+        ssh_keys=[ssh_pubkey],
+        metadata={"name": name},
+        hypervisor=HypervisorType.qemu,
+        requirements=requirements,
+        address=payer_address,
+        channel=sdk_settings.DEFAULT_CHANNEL,
+        storage_engine=StorageEnum.storage,
+        sync=True,
+    )
+
+    item_hash = str(message.item_hash)
+
+    # Set up port forwarding for SSH
+    await client.port_forwarder.create_ports(
+        item_hash=message.item_hash,
+        ports=Ports(root={22: PortFlags(tcp=True, udp=False)}),
+    )
+
+    invalidate_balance(payer_address or account.get_address())
+    _invalidate_instances(account.get_address())
 
     # Notify CRN to boot the VM
     async with VmClient(account, crn_url) as vm:
@@ -190,33 +395,45 @@ async def create_instance(
 
 
 async def _poll_networking(
-    account, item_hash: str, retries: int = 10, delay: float = 3.0
+    account,
+    item_hash: str,
+    retries: int = 20,
+    base_delay: float = 0.15,
+    max_delay: float = 2.0,
 ) -> tuple[str | None, int | None, str | None]:
-    """Poll for IPv4 host and SSH port after VM start."""
+    """Poll for IPv4 host and SSH port after VM start.
+
+    Backs off exponentially from base_delay up to max_delay, so fast boots
+    return within a few hundred ms while the worst case still waits ~30s.
+    The instance message is looked up once and reused for later attempts.
+    """
+    address = account.get_address()
+    inst = None
     for attempt in range(retries):
         try:
-            async with AlephHttpClient() as client:
+            client = await _get_client()
+            if inst is None:
+                instances, hashes = await _get_instances_cached(address)
+                if item_hash in hashes:
+                    inst = next(i for i in instances if str(i.item_hash) == item_hash)
+                else:
+                    # Not indexed yet — make the next attempt refetch.
+                    _invalidate_instances(address)
+            if inst is not None:
                 # Try to get execution info to find networking details
-                instances = await client.instance.get_instances(
-                    address=account.get_address()
-                )
-                for inst in instances:
-                    if str(inst.item_hash) == item_hash:
-                        executions = await client.instance.get_instance_executions_info(
-                            [inst]
-                        )
-                        if executions and item_hash in executions:
-                            exec_info = executions[item_hash]
-                            ipv4 = getattr(exec_info, "ipv4", None)
-                            port = getattr(exec_info, "ssh_port", None)
-                            ipv6 = getattr(exec_info, "ipv6", None)
-                            if ipv4 or port:
-                                return ipv4, port, ipv6
+                executions = await client.instance.get_instance_executions_info([inst])
+                if executions and item_hash in executions:
+                    exec_info = executions[item_hash]
+                    ipv4 = getattr(exec_info, "ipv4", None)
+                    port = getattr(exec_info, "ssh_port", None)
+                    ipv6 = getattr(exec_info, "ipv6", None)
+                    if ipv4 or port:
+                        return ipv4, port, ipv6
         except Exception as e:
             logger.debug("Polling attempt %d failed: %s", attempt, e)
 
         if attempt < retries - 1:
-            await asyncio.sleep(delay)
+            await asyncio.sleep(min(base_delay * 2**attempt, max_delay))
 
     logger.warning("Could not retrieve networking info for %s after %d attempts", item_hash, retries)
     return None, None, None
@@ -228,15 +445,36 @@ async def destroy_instance(
     item_hash: str,
     crn_url: str,
 ) -> None:
-    """Erase instance on CRN, delete port forwards, forget message."""
-    # 1. Erase on CRN
-    async with VmClient(account, crn_url) as vm:
-        await vm.erase_instance(vm_id=ItemHash(item_hash))
+    """Erase instance on CRN, delete port forwards, forget message.
 
-    # 2. Delete port forwards + forget message
-    async with AuthenticatedAlephHttpClient(account=account) as client:
-        await client.port_forwarder.delete_ports(item_hash=ItemHash(item_hash))
-        await client.forget(hashes=[ItemHash(item_hash)], reason="Agent cleanup")
+    The three steps are independent and run concurrently. Each one is
+    attempted even if another fails; the first failure is re-raised after
+    all have finished.
+    """
+    vm_hash = ItemHash(item_hash)
+
+    async def _erase() -> None:
+        async with VmClient(account, crn_url) as vm:
+            await vm.erase_instance(vm_id=vm_hash)
+
+    client = await _get_auth_client(account)
+    results = await asyncio.gather(
+        _erase(),
+        client.port_forwarder.delete_ports(item_hash=vm_hash),
+        client.forget(hashes=[vm_hash], reason="Agent cleanup"),
+        return_exceptions=True,
+    )
+
+    # The payer may be a delegating human address we don't know here.
+    invalidate_balance()
+    _invalidate_instances(account.get_address())
+
+    errors = [r for r in results if isinstance(r, BaseException)]
+    for step, result in zip(("erase", "delete_ports", "forget"), results):
+        if isinstance(result, BaseException):
+            logger.warning("destroy_instance %s failed for %s: %s", step, item_hash, result)
+    if errors:
+        raise errors[0]
 
 
 # ---------------------------------------------------------------------------
@@ -244,8 +482,38 @@ async def destroy_instance(
 # ---------------------------------------------------------------------------
 
 
+# Instance lists are re-read while polling for networking and by every
+# reconcile; keep them per address for a few seconds.
+INSTANCES_TTL_SECONDS: float = 5.0
+
+# address → (expires_at, fetch of (instance messages, item_hash set))
+_INSTANCES_CACHE: dict[str, tuple[float, asyncio.Future[tuple[list, set[str]]]]] = {}
+
+
+def _invalidate_instances(address: str | None = None) -> None:
+    if address is None:
+        _INSTANCES_CACHE.clear()
+    else:
+        _INSTANCES_CACHE.pop(address, None)
+
+
+async def _fetch_instances(address: str) -> tuple[list, set[str]]:
+    client = await _get_client()
+    instances = await client.instance.get_instances(address=address)
+    return instances, {str(inst.item_hash) for inst in instances}
+
+
+async def _get_instances_cached(address: str) -> tuple[list, set[str]]:
+    """Return (SDK instance messages, item_hash set) for address."""
+    return await _single_flight(
+        _INSTANCES_CACHE,
+        address,
+        INSTANCES_TTL_SECONDS,
+        lambda: _fetch_instances(address),
+    )
+
+
 async def list_instances(address: str) -> set[str]:
     """Return set of item_hashes for instances associated with address."""
-    async with AlephHttpClient() as client:
-        instances = await client.instance.get_instances(address=address)
-        return {str(inst.item_hash) for inst in instances}
+    _, hashes = await _get_instances_cached(address)
+    return set(hashes)
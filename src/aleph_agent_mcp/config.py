@@ -4,6 +4,7 @@ from __future__ import annotations
 
 from pathlib import Path
 
+from pydantic import PrivateAttr
 from pydantic_settings import BaseSettings
 
 
@@ -31,11 +32,16 @@ class Settings(BaseSettings):
     # OS image default
     default_os_image: str = "ubuntu22"
 
+    _paths_resolved: bool = PrivateAttr(default=False)
+
     def resolve_paths(self) -> None:
-        """Expand ~ in all Path fields."""
+        """Expand ~ in all Path fields. Later calls are no-ops."""
+        if self._paths_resolved:
+            return
         self.private_key_path = self.private_key_path.expanduser()
         self.ssh_pubkey_path = self.ssh_pubkey_path.expanduser()
         self.inventory_path = self.inventory_path.expanduser()
+        self._paths_resolved = True
 
 
 # Singleton — importable everywhere
@@ -1,36 +1,101 @@
-"""Local JSON inventory CRUD + reconciliation — no SDK imports."""
+"""Local JSON inventory CRUD + reconciliation — no SDK imports.
+
+The inventory is a JSON snapshot (``inventory.json``) plus an append-only
+journal (``inventory.json.log``) of add/del/patch operations, one JSON object
+per line. Mutations append a single line; the journal is folded back into the
+snapshot once it outgrows it. Parsed state is kept in memory and only rebuilt
+when either file changes on disk.
+"""
 
 from __future__ import annotations
 
 import fcntl
 import json
+import logging
+import os
+import threading
+import time
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from dataclasses import dataclass, fields, replace
 from datetime import datetime, timezone
 from pathlib import Path
 
 from .types import VmRecord
 
+try:
+    import orjson
+except ImportError:  # optional speedup: pip install aleph-agent-mcp[fast]
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+# Don't bother compacting until the journal is at least this large.
+_COMPACT_MIN_BYTES = 16 * 1024
+
+# Fields update_vm may patch: constructor fields other than the key
+_PATCHABLE_FIELDS = frozenset(
+    f.name for f in fields(VmRecord) if f.init and f.name != "item_hash"
+)
+
+_StatKey = tuple[int, int, int] | None  # (inode, mtime_ns, size)
+
+
+@dataclass
+class _InventoryState:
+    # item_hash → record; dict order preserves insertion order for iteration
+    records: dict[str, VmRecord]
+    signature: tuple[_StatKey, _StatKey]  # (snapshot, journal)
+
+
+_STATES: dict[Path, _InventoryState] = {}
+
+# Paths whose exclusive lock this thread holds. flock() on a second descriptor
+# would block on our own lock, so nested writers fail fast instead.
+_held = threading.local()
+
+
+def _held_paths() -> set[Path]:
+    paths = getattr(_held, "paths", None)
+    if paths is None:
+        paths = _held.paths = set()
+    return paths
+
 
 def _now_iso() -> str:
     return datetime.now(timezone.utc).isoformat()
 
 
+def _dumps(obj: object, *, indent: bool = False) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if indent else 0)
+    return json.dumps(obj, indent=2 if indent else None).encode()
+
+
+def _loads(data: bytes) -> object:
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
 def _load_raw(path: Path) -> list[dict]:
     if not path.exists():
         return []
-    text = path.read_text()
-    if not text.strip():
+    data = path.read_bytes()
+    if not data.strip():
         return []
-    return json.loads(text)
+    return _loads(data)
 
 
 def _save_raw(path: Path, records: list[dict]) -> None:
+    """Atomically replace the snapshot. Caller holds the exclusive lock."""
     path.parent.mkdir(parents=True, exist_ok=True)
-    with open(path, "w") as f:
-        fcntl.flock(f, fcntl.LOCK_EX)
-        try:
-            json.dump(records, f, indent=2)
-        finally:
-            fcntl.flock(f, fcntl.LOCK_UN)
+    tmp = path.with_name(path.name + ".tmp")
+    with open(tmp, "wb") as f:
+        f.write(_dumps(records, indent=True))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
 
 
 def _record_to_dict(r: VmRecord) -> dict:
@@ -71,70 +136,250 @@ def _dict_to_record(d: dict) -> VmRecord:
     )
 
 
+# ---------------------------------------------------------------------------
+# Journal
+# ---------------------------------------------------------------------------
+
+
+def _log_path(path: Path) -> Path:
+    return path.with_name(path.name + ".log")
+
+
+@contextmanager
+def _file_lock(path: Path, operation: int) -> Iterator[None]:
+    """Hold flock(operation) on the inventory's sidecar lock file.
+
+    Writers take LOCK_EX and readers LOCK_SH, so a reader never sees the
+    snapshot and journal mid-update.
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path.with_name(path.name + ".lock"), "a+") as f:
+        fcntl.flock(f, operation)
+        try:
+            yield
+        finally:
+            fcntl.flock(f, fcntl.LOCK_UN)
+
+
+def _stat_key(path: Path) -> _StatKey:
+    try:
+        st = path.stat()
+    except FileNotFoundError:
+        return None
+    return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+def _signature(path: Path) -> tuple[_StatKey, _StatKey]:
+    return (_stat_key(path), _stat_key(_log_path(path)))
+
+
+def _load_log(path: Path) -> list[dict]:
+    log = _log_path(path)
+    if not log.exists():
+        return []
+    ops = []
+    for line in log.read_bytes().splitlines():
+        if not line.strip():
+            continue
+        try:
+            ops.append(_loads(line))
+        except json.JSONDecodeError:  # orjson's error subclasses this
+            # A torn line from a crash mid-append. _append starts a fresh line
+            # after one, so it never swallows a later op.
+            logger.warning("Ignoring malformed inventory journal line in %s", log)
+    return ops
+
+
+def _apply_op(records: dict[str, VmRecord], op: dict) -> None:
+    """Apply one journal op. Replaying an op twice is harmless."""
+    kind = op.get("op")
+    if kind == "add":
+        record = _dict_to_record(op["record"])
+        records[record.item_hash] = record
+    elif kind == "del":
+        records.pop(op["item_hash"], None)
+    elif kind == "patch":
+        target = records.get(op["item_hash"])
+        if target is not None:
+            records[target.item_hash] = replace(target, **op["fields"])
+    else:
+        logger.warning("Ignoring unknown inventory journal op %r", kind)
+
+
+def _state(path: Path, *, locked: bool = False) -> _InventoryState:
+    """Return the in-memory inventory, rebuilding it if either file changed.
+
+    Pass locked=True when the caller already holds the exclusive lock.
+    """
+    state = _STATES.get(path)
+    if state is not None and state.signature == _signature(path):
+        return state
+    if not locked and path not in _held_paths():
+        with _file_lock(path, fcntl.LOCK_SH):
+            return _state(path, locked=True)
+
+    signature = _signature(path)
+    records = {}
+    for d in _load_raw(path):
+        record = _dict_to_record(d)
+        records[record.item_hash] = record
+    for op in _load_log(path):
+        try:
+            _apply_op(records, op)
+        except (AttributeError, KeyError, TypeError, ValueError) as e:
+            logger.warning("Skipping bad inventory journal op %r in %s: %s", op, path, e)
+    state = _InventoryState(records=records, signature=signature)
+    _STATES[path] = state
+    return state
+
+
+@contextmanager
+def _journal_lock(path: Path) -> Iterator[int]:
+    """Hold the exclusive inventory lock; yields the journal's append-mode fd.
+
+    Not re-entrant: raises RuntimeError if this thread already holds it.
+    """
+    held = _held_paths()
+    if path in held:
+        raise RuntimeError(
+            f"Inventory {path} is already locked by this thread "
+            "(write inside inventory_transaction?)"
+        )
+    with _file_lock(path, fcntl.LOCK_EX):
+        held.add(path)
+        fd = os.open(_log_path(path), os.O_RDWR | os.O_APPEND | os.O_CREAT, 0o666)
+        try:
+            yield fd
+        finally:
+            os.close(fd)
+            held.discard(path)
+
+
+def _rewrite_snapshot(path: Path, fd: int, state: _InventoryState) -> None:
+    """Write the snapshot from state and empty the journal (lock held)."""
+    _save_raw(path, [_record_to_dict(r) for r in state.records.values()])
+    os.ftruncate(fd, 0)
+    os.fsync(fd)
+    state.signature = _signature(path)
+
+
+def _append(path: Path, fd: int, state: _InventoryState, *ops: dict) -> None:
+    """Durably append ops to the journal and apply them to state (lock held).
+
+    The ops are applied to a copy first, so an op that fails is never written.
+    """
+    records = dict(state.records)
+    for op in ops:
+        _apply_op(records, op)
+    data = b"".join(_dumps(op) + b"\n" for op in ops)
+    size = os.fstat(fd).st_size
+    if size and os.pread(fd, 1, size - 1) != b"\n":
+        # Torn tail from an interrupted append: terminate it so this op
+        # isn't glued onto (and discarded with) the fragment.
+        data = b"\n" + data
+    os.write(fd, data)
+    os.fsync(fd)
+    state.records = records
+    state.signature = _signature(path)
+
+    log_size = state.signature[1][2] if state.signature[1] else 0
+    snapshot_size = state.signature[0][2] if state.signature[0] else 0
+    if log_size > max(snapshot_size, _COMPACT_MIN_BYTES):
+        _rewrite_snapshot(path, fd, state)
+
+
 # ---------------------------------------------------------------------------
 # Public API
 # ---------------------------------------------------------------------------
 
 
 def load_inventory(path: Path) -> list[VmRecord]:
-    return [_dict_to_record(d) for d in _load_raw(path)]
+    """Return all records. The records are frozen and shared with the
+    in-memory cache; change them through update_vm."""
+    return list(_state(path).records.values())
 
 
 def save_inventory(path: Path, records: list[VmRecord]) -> None:
-    _save_raw(path, [_record_to_dict(r) for r in records])
+    with _journal_lock(path) as fd:
+        state = _state(path, locked=True)
+        state.records = {r.item_hash: r for r in records}
+        _rewrite_snapshot(path, fd, state)
+
+
+@contextmanager
+def inventory_transaction(path: Path) -> Iterator[list[VmRecord]]:
+    """Load once, let the caller mutate the list, save once on clean exit.
+
+    The exclusive lock is held throughout; nothing is written if the block
+    raises. Change only the yielded list: reads are fine inside the block,
+    but add_vm/update_vm/remove_vm/save_inventory on the same path raise
+    RuntimeError.
+    """
+    with _journal_lock(path) as fd:
+        state = _state(path, locked=True)
+        records = list(state.records.values())
+        yield records
+        state.records = {r.item_hash: r for r in records}
+        _rewrite_snapshot(path, fd, state)
 
 
 def add_vm(path: Path, record: VmRecord) -> None:
-    records = load_inventory(path)
-    records.append(record)
-    save_inventory(path, records)
+    with _journal_lock(path) as fd:
+        state = _state(path, locked=True)
+        _append(path, fd, state, {"op": "add", "record": _record_to_dict(record)})
+
+
+def add_many(path: Path, records: Iterable[VmRecord]) -> None:
+    """Add several records with a single journal write and fsync."""
+    ops = [{"op": "add", "record": _record_to_dict(r)} for r in records]
+    if not ops:
+        return
+    with _journal_lock(path) as fd:
+        state = _state(path, locked=True)
+        _append(path, fd, state, *ops)
 
 
 def remove_vm(path: Path, item_hash: str) -> VmRecord | None:
-    records = load_inventory(path)
-    removed = None
-    kept = []
-    for r in records:
-        if r.item_hash == item_hash:
-            removed = r
-        else:
-            kept.append(r)
-    save_inventory(path, kept)
+    with _journal_lock(path) as fd:
+        state = _state(path, locked=True)
+        removed = state.records.get(item_hash)
+        if removed is not None:
+            _append(path, fd, state, {"op": "del", "item_hash": item_hash})
     return removed
 
 
 def find_vm(path: Path, item_hash: str) -> VmRecord | None:
-    for r in load_inventory(path):
-        if r.item_hash == item_hash:
-            return r
-    return None
+    return _state(path).records.get(item_hash)
 
 
 def update_vm(path: Path, item_hash: str, **updates: object) -> VmRecord | None:
-    records = load_inventory(path)
-    target = None
-    for r in records:
-        if r.item_hash == item_hash:
-            target = r
-            for k, v in updates.items():
-                setattr(r, k, v)
-            break
-    if target is not None:
-        save_inventory(path, records)
-    return target
+    unknown = updates.keys() - _PATCHABLE_FIELDS
+    if unknown:
+        raise ValueError(f"Cannot update VmRecord field(s): {sorted(unknown)}")
+    with _journal_lock(path) as fd:
+        state = _state(path, locked=True)
+        if item_hash not in state.records:
+            return None
+        _append(path, fd, state, {"op": "patch", "item_hash": item_hash, "fields": updates})
+        return state.records[item_hash]
+
+
+def filter_expired(
+    vms: Iterable[VmRecord], now_epoch: float | None = None
+) -> list[VmRecord]:
+    """Return the VMs in vms whose TTL has passed, without touching disk."""
+    if now_epoch is None:
+        now_epoch = time.time()
+    return [
+        vm
+        for vm in vms
+        if vm.ttl_expires_at_epoch is not None and now_epoch >= vm.ttl_expires_at_epoch
+    ]
 
 
 def check_expired_ttls(path: Path) -> list[VmRecord]:
     """Return VMs whose TTL has passed."""
-    now = datetime.now(timezone.utc)
-    expired = []
-    for vm in load_inventory(path):
-        if vm.ttl_expires_at is None:
-            continue
-        expires = datetime.fromisoformat(vm.ttl_expires_at)
-        if now >= expires:
-            expired.append(vm)
-    return expired
+    return filter_expired(_state(path).records.values())
 
 
 def reconcile(
@@ -143,10 +388,10 @@ def reconcile(
     """Compare local inventory against network state.
 
     Returns:
-        orphans: hashes on network but not in local inventory
-        stale: local records not found on network
+        orphans: hashes on network but not in local inventory (unordered)
+        stale: local records not found on network, in inventory order
     """
-    local_hashes = {vm.item_hash for vm in local}
-    orphans = sorted(network_hashes - local_hashes)
-    stale = [vm for vm in local if vm.item_hash not in network_hashes]
+    local_map = {vm.item_hash: vm for vm in local}
+    orphans = list(network_hashes - local_map.keys())
+    stale = [vm for h, vm in local_map.items() if h not in network_hashes]
     return orphans, stale
@@ -4,16 +4,20 @@ from __future__ import annotations
 
 from .types import SafetyCheckResult
 
+# Checks pass far more often than they fail; share one immutable pass result.
+_PASSED = SafetyCheckResult(passed=True)
+
 
 def check_ttl_range(ttl_hours: float, max_ttl_hours: float) -> SafetyCheckResult:
     if ttl_hours <= 0:
-        return SafetyCheckResult(passed=False, reason="TTL must be positive.")
+        return SafetyCheckResult(passed=False, reason="TTL must be positive.", kind="ttl")
     if ttl_hours > max_ttl_hours:
         return SafetyCheckResult(
             passed=False,
             reason=f"TTL {ttl_hours}h exceeds max {max_ttl_hours}h.",
+            kind="ttl",
         )
-    return SafetyCheckResult(passed=True)
+    return _PASSED
 
 
 def check_balance_guard(
@@ -30,8 +34,9 @@ def check_balance_guard(
                 f"below {guard_percent}% guard ({floor:.2f}). "
                 f"Current balance: {balance:.2f}, estimated cost: {estimated_cost:.2f}."
             ),
+            kind="balance",
         )
-    return SafetyCheckResult(passed=True)
+    return _PASSED
 
 
 def check_concurrent_limit(
@@ -41,15 +46,16 @@ def check_concurrent_limit(
         return SafetyCheckResult(
             passed=False,
             reason=f"Already at {active_count}/{max_concurrent} concurrent VMs.",
+            kind="concurrent",
         )
-    return SafetyCheckResult(passed=True)
+    return _PASSED
 
 
 def check_session_spend(
     session_spent: float, additional_cost: float, max_session_spend: float | None
 ) -> SafetyCheckResult:
     if max_session_spend is None:
-        return SafetyCheckResult(passed=True)
+        return _PASSED
     if session_spent + additional_cost > max_session_spend:
         return SafetyCheckResult(
             passed=False,
@@ -57,8 +63,9 @@ def check_session_spend(
                 f"Session spend would be {session_spent + additional_cost:.2f}, "
                 f"exceeding limit of {max_session_spend:.2f}."
             ),
+            kind="session_spend",
         )
-    return SafetyCheckResult(passed=True)
+    return _PASSED
 
 
 def check_cost_threshold(
@@ -73,8 +80,9 @@ def check_cost_threshold(
                 f"confirmation threshold ({threshold:.2f}). "
                 f"Call again with confirmation to proceed."
             ),
+            kind="threshold",
         )
-    return SafetyCheckResult(passed=True)
+    return _PASSED
 
 
 def run_pre_create_checks(
@@ -91,19 +99,21 @@ def run_pre_create_checks(
     cost_threshold: float,
     confirmed: bool = False,
 ) -> SafetyCheckResult:
-    """Run the full safety chain. Returns first failure or pass."""
-    for check in [
-        check_ttl_range(ttl_hours, max_ttl_hours),
-        check_balance_guard(balance, estimated_cost, guard_percent),
-        check_concurrent_limit(active_vm_count, max_concurrent),
-        check_session_spend(session_spent, estimated_cost, max_session_spend),
-    ]:
-        if not check.passed:
-            return check
-
+    """Run the full safety chain. Returns first failure or pass.
+
+    Checks run one at a time, cheapest first, and stop at the first failure.
+    """
+    if not (check := check_ttl_range(ttl_hours, max_ttl_hours)).passed:
+        return check
+    if not (check := check_concurrent_limit(active_vm_count, max_concurrent)).passed:
+        return check
+    if not (
+        check := check_session_spend(session_spent, estimated_cost, max_session_spend)
+    ).passed:
+        return check
+    if not (check := check_balance_guard(balance, estimated_cost, guard_percent)).passed:
+        return check
     if not confirmed:
-        threshold_check = check_cost_threshold(estimated_cost, cost_threshold)
-        if not threshold_check.passed:
-            return threshold_check
-
-    return SafetyCheckResult(passed=True)
+        if not (check := check_cost_threshold(estimated_cost, cost_threshold)).passed:
+            return check
+    return check
@@ -1,11 +1,19 @@
-"""FastMCP server — 6 tool registrations wired to business logic + aleph_ops."""
+"""FastMCP server — 7 tool registrations wired to business logic + aleph_ops."""
 
 from __future__ import annotations
 
+import asyncio
+import functools
 import logging
+import time
+from contextlib import asynccontextmanager, nullcontext
+from dataclasses import asdict, dataclass, field
 from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, NamedTuple
 
 from fastmcp import FastMCP
+from pydantic import ValidationError, validate_call
 
 from . import aleph_ops, inventory, safety, cost as cost_mod
 from .account import load_account, resolve_payer_address, resolve_sender_address
@@ -21,39 +29,171 @@ from .types import (
 
 logger = logging.getLogger(__name__)
 
+
+@asynccontextmanager
+async def _lifespan(server: FastMCP):
+    try:
+        yield
+    finally:
+        await aleph_ops.close_clients()
+
+
 mcp = FastMCP(
     "aleph-agent",
     instructions="Provision and manage VMs on Aleph Cloud decentralized network.",
+    lifespan=_lifespan,
 )
 
 # ---------------------------------------------------------------------------
 # Session state
 # ---------------------------------------------------------------------------
 
-_session_spend: float = 0.0
-_orphan_check_done: bool = False
-_credit_per_cu_hour: float | None = None
+PRICE_TTL_SECONDS: float = 3600.0
+
+
+@dataclass
+class SessionState:
+    """Per-process session counters.
+
+    ``lock`` guards the session-spend check together with its increment so
+    concurrent create/extend calls cannot both pass against the same budget.
+    """
+
+    spend: float = 0.0
+    orphan_check_done: bool = False
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+
+
+_state = SessionState()
+_credit_per_cu_hour: tuple[float, float] | None = None  # (expires_at, price)
+_price_lock = asyncio.Lock()
+
+
+def _reset_session() -> None:
+    """Start a fresh session: zero spend, re-run orphan checks, drop cached price.
+
+    The locks are rebuilt too; an asyncio.Lock that has been contended stays
+    bound to that event loop.
+    """
+    global _state, _credit_per_cu_hour, _price_lock
+    _state = SessionState()
+    _credit_per_cu_hour = None
+    _price_lock = asyncio.Lock()
 
 
 async def _get_price() -> float:
+    """Credit price per CU-hour, refreshed every PRICE_TTL_SECONDS.
+
+    Concurrent first callers wait on the lock and share one fetch.
+    """
     global _credit_per_cu_hour
-    if _credit_per_cu_hour is None:
-        _credit_per_cu_hour = await aleph_ops.get_credit_per_cu_hour()
-    return _credit_per_cu_hour
+    cached = _credit_per_cu_hour
+    if cached is not None and time.monotonic() < cached[0]:
+        return cached[1]
+    async with _price_lock:
+        cached = _credit_per_cu_hour
+        if cached is not None and time.monotonic() < cached[0]:
+            return cached[1]
+        price = await aleph_ops.get_credit_per_cu_hour()
+        _credit_per_cu_hour = (time.monotonic() + PRICE_TTL_SECONDS, price)
+        return price
+
+
+# Key files rarely change; re-read them only when their mtime does.
+@functools.lru_cache(maxsize=4)
+def _load_account_cached(path: Path, mtime_ns: int):
+    return load_account(path)
+
+
+@functools.lru_cache(maxsize=4)
+def _read_ssh_pubkey_cached(path: Path, mtime_ns: int) -> str:
+    return path.read_text().strip()
 
 
 def _account():
-    return load_account(settings.private_key_path)
+    path = settings.private_key_path
+    try:
+        mtime_ns = path.stat().st_mtime_ns
+    except FileNotFoundError:
+        # No key file: let the SDK fall back (Ledger account from config or
+        # its fallback key), uncached since there is no mtime to key on.
+        return load_account(path)
+    return _load_account_cached(path, mtime_ns)
+
+
+class _AccountBundle(NamedTuple):
+    account: Any
+    signing_address: str
+    signing_address_lower: str
+    sender: str  # address instances are listed under
+    payer: str  # address whose credit balance is spent
+    delegate: str | None  # create_instance address= for delegated payment
+
+
+@functools.lru_cache(maxsize=4)
+def _bundle_for(account, human_address: str | None) -> _AccountBundle:
+    signing_address = account.get_address()
+    sender = resolve_sender_address(account, human_address)
+    return _AccountBundle(
+        account=account,
+        signing_address=signing_address,
+        signing_address_lower=signing_address.lower(),
+        sender=sender,
+        payer=human_address or sender,
+        delegate=resolve_payer_address(human_address),
+    )
+
+
+def _account_bundle() -> _AccountBundle:
+    """The loaded account and the addresses derived from it, memoized."""
+    return _bundle_for(_account(), settings.human_address)
+
+
+def _ssh_pubkey() -> str:
+    path = settings.ssh_pubkey_path
+    return _read_ssh_pubkey_cached(path, path.stat().st_mtime_ns)
 
 
 def _now() -> datetime:
     return datetime.now(timezone.utc)
 
 
+def _raise_failures(*results: object) -> None:
+    """Re-raise the first exception among gather(return_exceptions=True) results."""
+    for result in results:
+        if isinstance(result, BaseException):
+            raise result
+
+
+@functools.lru_cache(maxsize=512)
+def _ssh_command_cached(host: str, port: int, user: str) -> str:
+    return "ssh -o StrictHostKeyChecking=no %s@%s -p %d" % (user, host, port)
+
+
 def _ssh_command(host: str | None, port: int | None, user: str = "root") -> str | None:
-    if not host or not port:
-        return None
-    return f"ssh -o StrictHostKeyChecking=no {user}@{host} -p {port}"
+    return _ssh_command_cached(host, port, user) if host and port else None
+
+
+def _summarize_vms(
+    vms: list[VmRecord], statuses: dict[str, str], now_epoch: float
+) -> list[VmSummary]:
+    """One pass over vms; statuses maps item_hash → status, default "running"."""
+    summaries = []
+    for vm in vms:
+        status = statuses.get(vm.item_hash, "running")
+        uptime = (now_epoch - vm.created_at_epoch) / 60.0
+        summaries.append(VmSummary(
+            item_hash=vm.item_hash,
+            name=vm.name,
+            status=status,
+            crn_url=vm.crn_url,
+            uptime_minutes=round(uptime, 1),
+            cost_so_far=round(vm.hourly_cost * uptime / 60.0, 2),
+            ttl_expires_at=vm.ttl_expires_at,
+            ssh_command=_ssh_command(vm.ipv4_host, vm.ssh_port, vm.ssh_user),
+            expired=status == "expired",
+        ))
+    return summaries
 
 
 # ---------------------------------------------------------------------------
@@ -66,29 +206,36 @@ async def _check_balance() -> dict:
 
     On first call per session, also runs orphan detection and TTL expiry check.
     """
-    global _orphan_check_done
+    now_epoch = _now().timestamp()
+    bundle = _account_bundle()
+    address, payer = bundle.sender, bundle.payer
+
+    # Orphan detection (once per session) reads the network alongside the rest
+    orphan_check = not _state.orphan_check_done
+
+    reads = [
+        aleph_ops.get_balance(payer),
+        _get_price(),
+        asyncio.to_thread(inventory.load_inventory, settings.inventory_path),
+    ]
+    if orphan_check:
+        reads.append(aleph_ops.list_instances(address))
+    balance, price, vms, *network = await asyncio.gather(*reads, return_exceptions=True)
+    _raise_failures(balance, price, vms)
+    if orphan_check:
+        _state.orphan_check_done = True
 
-    account = _account()
-    address = resolve_sender_address(account, settings.human_address)
-    payer = settings.human_address or address
-
-    balance = await aleph_ops.get_balance(payer)
-    price = await _get_price()
-
-    vms = inventory.load_inventory(settings.inventory_path)
     rate = cost_mod.burn_rate(vms, price)
     runway = cost_mod.runway_hours(balance, rate)
 
     # TTL expiry check
-    expired = inventory.check_expired_ttls(settings.inventory_path)
+    expired = inventory.filter_expired(vms, now_epoch)
 
-    # Orphan detection (once per session)
     warnings: list[str] = []
-    if not _orphan_check_done:
-        _orphan_check_done = True
+    if orphan_check:
         try:
-            network_hashes = await aleph_ops.list_instances(address)
-            orphans, stale = inventory.reconcile(vms, network_hashes)
+            _raise_failures(*network)
+            orphans, stale = inventory.reconcile(vms, network[0])
             if orphans:
                 warnings.append(
                     f"Orphaned VMs on network (not in local inventory): {orphans}"
@@ -108,33 +255,19 @@ async def _check_balance() -> dict:
             "Consider destroying them."
         )
 
-    now = _now()
-    summaries = []
-    for vm in vms:
-        created = datetime.fromisoformat(vm.created_at)
-        uptime = (now - created).total_seconds() / 60.0
-        summaries.append(VmSummary(
-            item_hash=vm.item_hash,
-            name=vm.name,
-            status="expired" if vm in expired else "running",
-            crn_url=vm.crn_url,
-            uptime_minutes=round(uptime, 1),
-            cost_so_far=round(cost_mod.cost_since_creation(vm, uptime), 2),
-            ttl_expires_at=vm.ttl_expires_at,
-            ssh_command=_ssh_command(vm.ipv4_host, vm.ssh_port, vm.ssh_user),
-            expired=vm in expired,
-        ))
+    statuses = {vm.item_hash: "expired" for vm in expired}
+    summaries = _summarize_vms(vms, statuses, now_epoch)
 
-    result = BalanceResult(
+    # The result objects are discarded, so their __dict__s are returned as-is
+    # rather than copied.
+    out = BalanceResult(
         balance_credits=balance,
         burn_rate_per_hour=round(rate, 3),
         runway_hours=round(runway, 1) if runway is not None else None,
         active_vm_count=len(vms),
         active_vms=summaries,
-    )
-
-    out = result.__dict__.copy()
-    out["active_vms"] = [s.__dict__ for s in result.active_vms]
+    ).__dict__
+    out["active_vms"] = [s.__dict__ for s in summaries]
     if warnings:
         out["warnings"] = warnings
     return out
@@ -151,9 +284,7 @@ async def _list_crns(
         gpu: If true, filter for CRNs with GPU support.
     """
     crns = await aleph_ops.list_crns(min_compute_units=min_compute_units, gpu=gpu)
-    if gpu:
-        crns = [c for c in crns if c.has_gpu]
-    return [c.__dict__ for c in crns]
+    return [asdict(c) for c in crns]
 
 
 async def _create_vm(
@@ -178,42 +309,45 @@ async def _create_vm(
         purpose: Optional description of why this VM is needed.
         confirmed: Set true to bypass cost confirmation threshold.
     """
-    global _session_spend
-
     ttl = ttl_hours if ttl_hours is not None else settings.default_ttl_hours
-    price = await _get_price()
-    estimate = cost_mod.estimate_cost(compute_units, ttl, price)
-
-    account = _account()
-    payer = settings.human_address or resolve_sender_address(account, settings.human_address)
-    balance = await aleph_ops.get_balance(payer)
+    bundle = _account_bundle()
+    account, payer = bundle.account, bundle.payer
+
+    reads = [
+        _get_price(),
+        aleph_ops.get_balance(payer),
+        asyncio.to_thread(inventory.load_inventory, settings.inventory_path),
+    ]
+    if not dry_run:
+        reads.append(aleph_ops.find_crn(crn_hash))
+    price, balance, vms, *crn = await asyncio.gather(*reads, return_exceptions=True)
+    _raise_failures(price, balance, vms)
 
-    expired = inventory.check_expired_ttls(settings.inventory_path)
-    vms = inventory.load_inventory(settings.inventory_path)
+    estimate = cost_mod.estimate_cost(compute_units, ttl, price)
+    expired = inventory.filter_expired(vms)
     active_count = len(vms)
 
-    check = safety.run_pre_create_checks(
-        ttl_hours=ttl,
-        max_ttl_hours=settings.max_ttl_hours,
-        balance=balance,
-        estimated_cost=estimate.total_cost,
-        guard_percent=settings.balance_guard_percent,
-        active_vm_count=active_count,
-        max_concurrent=settings.max_concurrent_vms,
-        session_spent=_session_spend,
-        max_session_spend=settings.max_session_spend,
-        cost_threshold=settings.cost_threshold,
-        confirmed=confirmed,
-    )
+    # Check and reserve the session budget in one step; the reservation is
+    # released below if the create does not go through.
+    async with _state.lock:
+        check = safety.run_pre_create_checks(
+            ttl_hours=ttl,
+            max_ttl_hours=settings.max_ttl_hours,
+            balance=balance,
+            estimated_cost=estimate.total_cost,
+            guard_percent=settings.balance_guard_percent,
+            active_vm_count=active_count,
+            max_concurrent=settings.max_concurrent_vms,
+            session_spent=_state.spend,
+            max_session_spend=settings.max_session_spend,
+            cost_threshold=settings.cost_threshold,
+            confirmed=confirmed,
+        )
+        if check.passed and not dry_run:
+            _state.spend += estimate.total_cost
 
     if not check.passed:
-        is_threshold = (
-            not confirmed
-            and not safety.check_cost_threshold(
-                estimate.total_cost, settings.cost_threshold
-            ).passed
-        )
-        if is_threshold:
+        if check.kind == "threshold":
             return CreateVmResult(
                 item_hash="",
                 ssh_command=None,
@@ -244,23 +378,29 @@ async def _create_vm(
             dry_run=True,
         ).__dict__
 
-    crn_info = await aleph_ops.find_crn(crn_hash)
-    if crn_info is None:
-        return {"error": f"CRN {crn_hash} not found or inactive."}
-
-    ssh_pubkey = settings.ssh_pubkey_path.read_text().strip()
-
-    item_hash, ipv4_host, ssh_port, ipv6 = await aleph_ops.create_instance(
-        account,
-        crn_hash=crn_hash,
-        crn_url=crn_info.url,
-        ssh_pubkey=ssh_pubkey,
-        compute_units=compute_units,
-        os_image=os_image,
-        name=name,
-        payer_address=resolve_payer_address(settings.human_address),
-        terms_and_conditions=crn_info.terms_and_conditions,
-    )
+    try:
+        _raise_failures(*crn)
+        crn_info = crn[0]
+        if crn_info is None:
+            _state.spend -= estimate.total_cost
+            return {"error": f"CRN {crn_hash} not found or inactive."}
+
+        ssh_pubkey = _ssh_pubkey()
+
+        item_hash, ipv4_host, ssh_port, ipv6 = await aleph_ops.create_instance(
+            account,
+            crn_hash=crn_hash,
+            crn_url=crn_info.url,
+            ssh_pubkey=ssh_pubkey,
+            compute_units=compute_units,
+            os_image=os_image,
+            name=name,
+            payer_address=bundle.delegate,
+            terms_and_conditions=crn_info.terms_and_conditions,
+        )
+    except BaseException:
+        _state.spend -= estimate.total_cost
+        raise
 
     record = VmRecord(
         item_hash=item_hash,
@@ -271,15 +411,13 @@ async def _create_vm(
         created_at=_now().isoformat(),
         ttl_expires_at=ttl_expires,
         hourly_cost=estimate.hourly_cost,
-        signing_address=account.get_address(),
+        signing_address=bundle.signing_address,
         purpose=purpose,
         ipv4_host=ipv4_host,
         ssh_port=ssh_port,
         ipv6=ipv6,
     )
-    inventory.add_vm(settings.inventory_path, record)
-
-    _session_spend += estimate.total_cost
+    await asyncio.to_thread(inventory.add_vm, settings.inventory_path, record)
 
     warnings = []
     if expired:
@@ -308,19 +446,22 @@ async def _destroy_vm(item_hash: str) -> dict:
     Args:
         item_hash: The instance item_hash (from aleph_create_vm or aleph_list_my_vms).
     """
-    record = inventory.find_vm(settings.inventory_path, item_hash)
+    record = await asyncio.to_thread(inventory.find_vm, settings.inventory_path, item_hash)
     if record is None:
         return {"error": f"VM {item_hash} not found in local inventory."}
 
-    account = _account()
-    current_address = account.get_address()
+    bundle = _account_bundle()
+    account = bundle.account
 
     # Key-match guard: prevent silent no-op when the wrong key is loaded
-    if record.signing_address and current_address.lower() != record.signing_address.lower():
+    if (
+        record.signing_address
+        and record.signing_address.lower() != bundle.signing_address_lower
+    ):
         return {
             "error": (
                 f"Key mismatch: this VM was created by {record.signing_address}, "
-                f"but the current key signs as {current_address}. "
+                f"but the current key signs as {bundle.signing_address}. "
                 f"Load the original key to destroy this VM."
             )
         }
@@ -331,11 +472,9 @@ async def _destroy_vm(item_hash: str) -> dict:
         crn_url=record.crn_url,
     )
 
-    inventory.remove_vm(settings.inventory_path, item_hash)
+    await asyncio.to_thread(inventory.remove_vm, settings.inventory_path, item_hash)
 
-    now = _now()
-    created = datetime.fromisoformat(record.created_at)
-    runtime = (now - created).total_seconds() / 60.0
+    runtime = (_now().timestamp() - record.created_at_epoch) / 60.0
     estimated_cost = cost_mod.cost_since_creation(record, runtime)
 
     return DestroyVmResult(
@@ -350,41 +489,23 @@ async def _list_my_vms() -> list[dict]:
 
     Flags orphans (on network but not tracked) and expired TTLs.
     """
-    account = _account()
-    address = resolve_sender_address(account, settings.human_address)
+    now_epoch = _now().timestamp()
+    address = _account_bundle().sender
 
-    vms = inventory.load_inventory(settings.inventory_path)
+    vms = await asyncio.to_thread(inventory.load_inventory, settings.inventory_path)
     price = await _get_price()
-    expired_set = {vm.item_hash for vm in inventory.check_expired_ttls(settings.inventory_path)}
-
-    stale_set: set[str] = set()
     try:
         network_hashes = await aleph_ops.list_instances(address)
         orphans, stale = inventory.reconcile(vms, network_hashes)
-        stale_set = {vm.item_hash for vm in stale}
     except Exception:
         orphans, stale = [], []
 
-    now = _now()
-    results = []
-    for vm in vms:
-        created = datetime.fromisoformat(vm.created_at)
-        uptime = (now - created).total_seconds() / 60.0
-        results.append(VmSummary(
-            item_hash=vm.item_hash,
-            name=vm.name,
-            status=(
-                "expired" if vm.item_hash in expired_set
-                else "stale" if vm.item_hash in stale_set
-                else "running"
-            ),
-            crn_url=vm.crn_url,
-            uptime_minutes=round(uptime, 1),
-            cost_so_far=round(cost_mod.cost_since_creation(vm, uptime), 2),
-            ttl_expires_at=vm.ttl_expires_at,
-            ssh_command=_ssh_command(vm.ipv4_host, vm.ssh_port, vm.ssh_user),
-            expired=vm.item_hash in expired_set,
-        ).__dict__)
+    # Expired takes precedence over stale
+    statuses = {vm.item_hash: "stale" for vm in stale}
+    statuses.update(
+        (vm.item_hash, "expired") for vm in inventory.filter_expired(vms, now_epoch)
+    )
+    results = [s.__dict__ for s in _summarize_vms(vms, statuses, now_epoch)]
 
     for h in orphans:
         results.append({
@@ -409,51 +530,122 @@ async def _extend_vm(item_hash: str, additional_hours: float) -> dict:
         item_hash: The instance item_hash.
         additional_hours: Hours to add to the current TTL.
     """
-    global _session_spend
-
-    record = inventory.find_vm(settings.inventory_path, item_hash)
+    record = await asyncio.to_thread(inventory.find_vm, settings.inventory_path, item_hash)
     if record is None:
         return {"error": f"VM {item_hash} not found in local inventory."}
 
-    price = await _get_price()
+    payer = _account_bundle().payer
+    price, balance = await asyncio.gather(_get_price(), aleph_ops.get_balance(payer))
     additional_cost = record.compute_units * price * additional_hours
 
-    account = _account()
-    payer = settings.human_address or resolve_sender_address(account, settings.human_address)
-    balance = await aleph_ops.get_balance(payer)
-
     guard = safety.check_balance_guard(balance, additional_cost, settings.balance_guard_percent)
     if not guard.passed:
         return {"error": guard.reason}
 
-    spend_check = safety.check_session_spend(
-        _session_spend, additional_cost, settings.max_session_spend
-    )
-    if not spend_check.passed:
-        return {"error": spend_check.reason}
+    async with _state.lock:
+        spend_check = safety.check_session_spend(
+            _state.spend, additional_cost, settings.max_session_spend
+        )
+        if not spend_check.passed:
+            return {"error": spend_check.reason}
+
+        # Re-read under the lock: a concurrent extend may have moved the TTL
+        record = await asyncio.to_thread(inventory.find_vm, settings.inventory_path, item_hash)
+        if record is None:
+            return {"error": f"VM {item_hash} not found in local inventory."}
+        current_expiry = record.ttl_expires_at_epoch
+        if current_expiry is None:
+            current_expiry = _now().timestamp()
+        new_expiry = current_expiry + additional_hours * 3600.0
+
+        total_ttl_hours = (new_expiry - record.created_at_epoch) / 3600.0
+        ttl_check = safety.check_ttl_range(total_ttl_hours, settings.max_ttl_hours)
+        if not ttl_check.passed:
+            return {"error": ttl_check.reason}
+
+        new_expiry_iso = datetime.fromtimestamp(new_expiry, timezone.utc).isoformat()
+        await asyncio.to_thread(
+            inventory.update_vm,
+            settings.inventory_path,
+            item_hash,
+            ttl_expires_at=new_expiry_iso,
+        )
+        _state.spend += additional_cost
 
-    if record.ttl_expires_at:
-        current_expiry = datetime.fromisoformat(record.ttl_expires_at)
-    else:
-        current_expiry = _now()
+    return ExtendVmResult(
+        new_ttl_expires_at=new_expiry_iso,
+        additional_cost_estimate=round(additional_cost, 2),
+    ).__dict__
 
-    new_expiry = current_expiry + timedelta(hours=additional_hours)
 
-    created = datetime.fromisoformat(record.created_at)
-    total_ttl_hours = (new_expiry - created).total_seconds() / 3600.0
-    ttl_check = safety.check_ttl_range(total_ttl_hours, settings.max_ttl_hours)
-    if not ttl_check.passed:
-        return {"error": ttl_check.reason}
+# Batch args arrive as raw JSON, so each handler validates them against its
+# signature the way the registered tools do (e.g. "false" -> False).
+_BATCH_DISPATCH = {
+    name: validate_call(handler)
+    for name, handler in {
+        "aleph_check_balance": _check_balance,
+        "aleph_list_crns": _list_crns,
+        "aleph_create_vm": _create_vm,
+        "aleph_destroy_vm": _destroy_vm,
+        "aleph_list_my_vms": _list_my_vms,
+        "aleph_extend_vm": _extend_vm,
+    }.items()
+}
+
+# Tools that change inventory or spend. Their safety checks read the current
+# inventory and balance, so within a batch they must run one at a time.
+_BATCH_SERIAL = frozenset({"aleph_create_vm", "aleph_destroy_vm", "aleph_extend_vm"})
+
+
+async def _batch(
+    ops: list[dict],
+    max_concurrent: int = 4,
+    stop_on_error: bool = False,
+) -> list[dict]:
+    """Run several tool calls in one request, up to max_concurrent at a time.
 
-    inventory.update_vm(
-        settings.inventory_path, item_hash, ttl_expires_at=new_expiry.isoformat()
-    )
-    _session_spend += additional_cost
+    Create, destroy and extend run one at a time so each sees the inventory
+    and balance left by the previous one.
 
-    return ExtendVmResult(
-        new_ttl_expires_at=new_expiry.isoformat(),
-        additional_cost_estimate=round(additional_cost, 2),
-    ).__dict__
+    Args:
+        ops: List of {"tool": <tool name>, "args": {...}}.
+        max_concurrent: Maximum number of operations in flight at once.
+        stop_on_error: If true, operations not yet started after a failure
+            are skipped.
+    """
+    sem = asyncio.Semaphore(max(1, max_concurrent))
+    serial = asyncio.Lock()
+    failed = asyncio.Event()
+
+    async def run(op: dict) -> dict:
+        tool = op.get("tool")
+        handler = _BATCH_DISPATCH.get(tool)
+        if handler is None:
+            entry = {
+                "tool": tool,
+                "error": f"Unknown tool {tool!r}. Valid: {sorted(_BATCH_DISPATCH)}",
+            }
+        else:
+            # Take the serial lock before a semaphore slot so queued writes
+            # don't hold slots that reads could use.
+            async with serial if tool in _BATCH_SERIAL else nullcontext(), sem:
+                if stop_on_error and failed.is_set():
+                    return {"tool": tool, "error": "Skipped: an earlier operation failed."}
+                try:
+                    result = await handler(**op.get("args", {}))
+                except ValidationError as e:
+                    entry = {"tool": tool, "error": f"Invalid arguments: {e}"}
+                except Exception as e:
+                    entry = {"tool": tool, "error": f"{type(e).__name__}: {e}"}
+                else:
+                    entry = {"tool": tool, "result": result}
+                    if isinstance(result, dict) and "error" in result:
+                        entry["error"] = result["error"]
+        if "error" in entry:
+            failed.set()
+        return entry
+
+    return list(await asyncio.gather(*(run(op) for op in ops)))
 
 
 # ---------------------------------------------------------------------------
@@ -547,3 +739,23 @@ async def aleph_extend_vm(item_hash: str, additional_hours: float) -> dict:
         additional_hours: Hours to add to the current TTL.
     """
     return await _extend_vm(item_hash=item_hash, additional_hours=additional_hours)
+
+
+@mcp.tool()
+async def aleph_batch(
+    ops: list[dict],
+    max_concurrent: int = 4,
+    stop_on_error: bool = False,
+) -> list[dict]:
+    """Run several aleph_* tool calls in one request, up to max_concurrent at a time.
+
+    Each result is {"tool", "result"} on success or {"tool", "error"} on failure,
+    in the same order as ops.
+
+    Args:
+        ops: List of {"tool": <tool name>, "args": {...}}, e.g.
+            [{"tool": "aleph_check_balance"}, {"tool": "aleph_list_crns", "args": {"gpu": true}}].
+        max_concurrent: Maximum number of operations in flight at once.
+        stop_on_error: If true, operations not yet started after a failure are skipped.
+    """
+    return await _batch(ops, max_concurrent=max_concurrent, stop_on_error=stop_on_error)
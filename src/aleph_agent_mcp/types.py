@@ -2,15 +2,23 @@
 
 from __future__ import annotations
 
+import functools
 from dataclasses import dataclass, field
 from datetime import datetime
 
 
+# Records are rebuilt from the same timestamp strings on every journal replay
+# and patch, so the parse is memoized.
+@functools.lru_cache(maxsize=1024)
+def _iso_to_epoch(value: str) -> float:
+    return datetime.fromisoformat(value).timestamp()
+
+
 # ---------------------------------------------------------------------------
 # CRN
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class CrnInfo:
     hash: str
     name: str
@@ -25,7 +33,7 @@ class CrnInfo:
 # VM / Instance
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class VmRecord:
     """Local inventory record for a provisioned VM."""
 
@@ -43,6 +51,21 @@ class VmRecord:
     ipv4_host: str | None = None
     ssh_port: int | None = None
     ipv6: str | None = None
+    # Epoch seconds parsed once at construction; the ISO strings above are
+    # kept for serialization only.
+    created_at_epoch: float = field(default=0.0, init=False, repr=False, compare=False)
+    ttl_expires_at_epoch: float | None = field(
+        default=None, init=False, repr=False, compare=False
+    )
+
+    def __post_init__(self) -> None:
+        # Frozen: derived fields are set through object.__setattr__
+        object.__setattr__(self, "created_at_epoch", _iso_to_epoch(self.created_at))
+        object.__setattr__(
+            self,
+            "ttl_expires_at_epoch",
+            _iso_to_epoch(self.ttl_expires_at) if self.ttl_expires_at else None,
+        )
 
 
 # ---------------------------------------------------------------------------
@@ -103,10 +126,11 @@ class ExtendVmResult:
 # Safety
 # ---------------------------------------------------------------------------
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class SafetyCheckResult:
     passed: bool
     reason: str | None = None
+    kind: str | None = None  # which check failed: ttl, concurrent, session_spend, balance, threshold
 
 
 @dataclass
@@ -7,9 +7,21 @@ from pathlib import Path
 
 import pytest
 
+from aleph_agent_mcp import config, server
 from aleph_agent_mcp.types import VmRecord
 
 
+@pytest.fixture(autouse=True)
+def _no_leaked_settings():
+    """Fail a test that leaves server.settings swapped out.
+
+    Tests must not depend on each other's module state, so the suite can run
+    under pytest-xdist (-n auto) in any order.
+    """
+    yield
+    assert server.settings is config.settings, "server.settings was not restored"
+
+
 @pytest.fixture
 def tmp_inventory(tmp_path: Path) -> Path:
     return tmp_path / "inventory.json"
@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
@@ -9,6 +10,34 @@ import pytest
 from aleph_agent_mcp import aleph_ops
 
 
+async def _reset_module_state() -> None:
+    await aleph_ops.close_clients()
+    aleph_ops.invalidate_pricing_cache()
+    aleph_ops.invalidate_balance()
+    aleph_ops.invalidate_crn_cache()
+    aleph_ops._invalidate_instances()
+
+
+@pytest.fixture(autouse=True)
+async def reset_caches():
+    await _reset_module_state()
+    yield
+    await _reset_module_state()
+
+
+def _contend_in_two_loops(reset, call) -> None:
+    """Run three concurrent call()s in two fresh event loops, resetting between.
+
+    A module lock that was contended in one loop must not break the next.
+    """
+    async def contend():
+        await asyncio.gather(*(call() for _ in range(3)))
+
+    for _ in range(2):
+        asyncio.run(reset())
+        asyncio.run(contend())
+
+
 @pytest.mark.asyncio
 class TestGetBalance:
     async def test_returns_float(self):
@@ -25,6 +54,33 @@ class TestGetBalance:
             assert result == 500.0
             assert isinstance(result, float)
 
+    async def test_single_flight_per_address(self):
+        balances = {"0xa": 100, "0xb": 200}
+
+        async def get_balances(address):
+            await asyncio.sleep(0)
+            mock_balance = MagicMock()
+            mock_balance.credit_balance = balances[address]
+            return mock_balance
+
+        mock_client = AsyncMock()
+        mock_client.get_balances = AsyncMock(side_effect=get_balances)
+        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = AsyncMock(return_value=False)
+
+        with patch("aleph_agent_mcp.aleph_ops.AlephHttpClient", return_value=mock_client):
+            results = await asyncio.gather(
+                aleph_ops.get_balance("0xa"),
+                aleph_ops.get_balance("0xb"),
+                aleph_ops.get_balance("0xa"),
+            )
+            assert results == [100.0, 200.0, 100.0]
+            assert mock_client.get_balances.await_count == 2
+
+            aleph_ops.invalidate_balance("0xa")
+            assert await aleph_ops.get_balance("0xa") == 100.0
+            assert mock_client.get_balances.await_count == 3
+
 
 @pytest.mark.asyncio
 class TestGetCreditPerCuHour:
@@ -55,6 +111,33 @@ class TestGetCreditPerCuHour:
             result = await aleph_ops.get_credit_per_cu_hour()
             assert result == 1.425
 
+    async def test_cached_within_ttl(self):
+        mock_price = MagicMock()
+        mock_price.credit = 1.425
+
+        mock_pricing = MagicMock()
+        mock_pricing.price = {"compute_unit": mock_price}
+
+        mock_client = AsyncMock()
+        mock_client.pricing = MagicMock()
+        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = AsyncMock(return_value=False)
+
+        with patch("aleph_agent_mcp.aleph_ops.AlephHttpClient", return_value=mock_client), \
+             patch("aleph_agent_mcp.aleph_ops.PricingEntity") as mock_pe:
+            mock_client.pricing.get_pricing_aggregate = AsyncMock(
+                return_value={mock_pe.INSTANCE: mock_pricing}
+            )
+            results = await asyncio.gather(
+                *(aleph_ops.get_credit_per_cu_hour() for _ in range(5))
+            )
+            assert results == [1.425] * 5
+            assert mock_client.pricing.get_pricing_aggregate.await_count == 1
+
+            aleph_ops.invalidate_pricing_cache()
+            await aleph_ops.get_credit_per_cu_hour()
+            assert mock_client.pricing.get_pricing_aggregate.await_count == 2
+
 
 class TestResolveTier:
     def test_valid_tiers(self):
@@ -65,6 +148,150 @@ class TestResolveTier:
     def test_invalid_tier(self):
         with pytest.raises(ValueError, match="Invalid compute_units"):
             aleph_ops._resolve_tier(5)
+        with pytest.raises(ValueError, match="Invalid compute_units"):
+            aleph_ops._resolve_tier(-1)
+        with pytest.raises(ValueError, match="Invalid compute_units"):
+            aleph_ops._resolve_tier(13)
+        with pytest.raises(ValueError, match="Invalid compute_units"):
+            aleph_ops._resolve_tier(2.5)
+        assert aleph_ops._resolve_tier(2.0) == aleph_ops._resolve_tier(2)
+
+
+def _mock_crn(
+    crn_hash: str,
+    name: str = "crn",
+    gpu: bool = False,
+    capacity: tuple[int, int, int] | None = None,
+) -> MagicMock:
+    crn = MagicMock()
+    crn.hash = crn_hash
+    crn.name = name
+    crn.address = f"https://{crn_hash}.example.com"
+    crn.version = "1.0.0"
+    crn.gpu_support = gpu
+    crn.terms_and_conditions = None
+    crn.system_usage = None
+    if capacity is not None:
+        vcpus, memory_mib, disk_mib = capacity
+        crn.system_usage = MagicMock()
+        crn.system_usage.cpu.count = vcpus
+        crn.system_usage.mem.available_kB = memory_mib * 1024
+        crn.system_usage.disk.available_kB = disk_mib * 1024
+    return crn
+
+
+def _crn_client(crns: list) -> AsyncMock:
+    crn_list = MagicMock()
+    crn_list.crns = crns
+
+    mock_client = AsyncMock()
+    mock_client.crn = MagicMock()
+    mock_client.crn.get_crns_list = AsyncMock(return_value=crn_list)
+    mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+    mock_client.__aexit__ = AsyncMock(return_value=False)
+    return mock_client
+
+
+@pytest.mark.asyncio
+class TestCrnCache:
+    async def test_list_and_find_share_one_fetch(self):
+        mock_client = _crn_client([_mock_crn("h1"), _mock_crn("h2", gpu=True)])
+
+        with patch("aleph_agent_mcp.aleph_ops.AlephHttpClient", return_value=mock_client):
+            crns = await aleph_ops.list_crns()
+            assert [c.hash for c in crns] == ["h1", "h2"]
+
+            found = await aleph_ops.find_crn("h2")
+            assert found is not None
+            assert found.url == "https://h2.example.com"
+            assert found.has_gpu is True
+            assert await aleph_ops.find_crn("missing") is None
+
+            assert mock_client.crn.get_crns_list.await_count == 1
+
+    async def test_filters_by_tier_and_gpu(self):
+        mock_client = _crn_client([
+            _mock_crn("small", capacity=(1, 2048, 20_480)),
+            _mock_crn("big", capacity=(8, 32_768, 500_000)),
+            _mock_crn("gpu", gpu=True, capacity=(8, 32_768, 500_000)),
+            _mock_crn("unknown"),
+        ])
+
+        with patch("aleph_agent_mcp.aleph_ops.AlephHttpClient", return_value=mock_client):
+            crns = await aleph_ops.list_crns(min_compute_units=4)
+            assert [c.hash for c in crns] == ["big", "gpu", "unknown"]
+
+            crns = await aleph_ops.list_crns(gpu=True)
+            assert [c.hash for c in crns] == ["gpu"]
+
+
+@pytest.mark.asyncio
+class TestPollNetworking:
+    async def test_backoff_and_single_instance_lookup(self):
+        account = MagicMock()
+        account.get_address.return_value = "0xagent"
+        inst = MagicMock()
+        inst.item_hash = "vm1"
+        exec_info = MagicMock(ipv4="1.2.3.4", ssh_port=2222, ipv6=None)
+
+        mock_client = AsyncMock()
+        mock_client.instance = MagicMock()
+        mock_client.instance.get_instances = AsyncMock(return_value=[inst])
+        mock_client.instance.get_instance_executions_info = AsyncMock(
+            side_effect=[{}, {}, {"vm1": exec_info}]
+        )
+        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = AsyncMock(return_value=False)
+
+        with patch("aleph_agent_mcp.aleph_ops.AlephHttpClient", return_value=mock_client), \
+             patch("aleph_agent_mcp.aleph_ops.asyncio.sleep", new_callable=AsyncMock) as sleep:
+            result = await aleph_ops._poll_networking(account, "vm1")
+
+        assert result == ("1.2.3.4", 2222, None)
+        assert mock_client.instance.get_instances.await_count == 1
+        assert [c.args[0] for c in sleep.await_args_list] == [0.15, 0.3]
+
+
+@pytest.mark.asyncio
+class TestDestroyInstance:
+    def _clients(self, forget_error: Exception | None = None):
+        account = MagicMock()
+        account.get_address.return_value = "0xagent"
+
+        auth_client = AsyncMock()
+        auth_client.port_forwarder = MagicMock()
+        auth_client.port_forwarder.delete_ports = AsyncMock()
+        auth_client.forget = AsyncMock(side_effect=forget_error)
+        auth_client.__aenter__ = AsyncMock(return_value=auth_client)
+        auth_client.__aexit__ = AsyncMock(return_value=False)
+
+        vm = AsyncMock()
+        vm.erase_instance = AsyncMock()
+        vm.__aenter__ = AsyncMock(return_value=vm)
+        vm.__aexit__ = AsyncMock(return_value=False)
+        return account, auth_client, vm
+
+    async def test_runs_all_steps(self):
+        account, auth_client, vm = self._clients()
+        with patch("aleph_agent_mcp.aleph_ops.AuthenticatedAlephHttpClient", return_value=auth_client), \
+             patch("aleph_agent_mcp.aleph_ops.VmClient", return_value=vm):
+            await aleph_ops.destroy_instance(
+                account, item_hash="a" * 64, crn_url="https://crn.example.com"
+            )
+        vm.erase_instance.assert_awaited_once()
+        auth_client.port_forwarder.delete_ports.assert_awaited_once()
+        auth_client.forget.assert_awaited_once()
+
+    async def test_partial_failure_still_runs_other_steps(self):
+        account, auth_client, vm = self._clients(forget_error=RuntimeError("boom"))
+        with patch("aleph_agent_mcp.aleph_ops.AuthenticatedAlephHttpClient", return_value=auth_client), \
+             patch("aleph_agent_mcp.aleph_ops.VmClient", return_value=vm):
+            with pytest.raises(RuntimeError, match="boom"):
+                await aleph_ops.destroy_instance(
+                    account, item_hash="a" * 64, crn_url="https://crn.example.com"
+                )
+        vm.erase_instance.assert_awaited_once()
+        auth_client.port_forwarder.delete_ports.assert_awaited_once()
 
 
 @pytest.mark.asyncio
@@ -84,3 +311,82 @@ class TestListInstances:
         with patch("aleph_agent_mcp.aleph_ops.AlephHttpClient", return_value=mock_client):
             result = await aleph_ops.list_instances("0xtest")
             assert result == {"hash1", "hash2"}
+
+    async def test_cached_per_address(self):
+        mock_inst = MagicMock()
+        mock_inst.item_hash = "hash1"
+
+        mock_client = AsyncMock()
+        mock_client.instance = MagicMock()
+        mock_client.instance.get_instances = AsyncMock(return_value=[mock_inst])
+        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = AsyncMock(return_value=False)
+
+        with patch("aleph_agent_mcp.aleph_ops.AlephHttpClient", return_value=mock_client):
+            await aleph_ops.list_instances("0xa")
+            await aleph_ops.list_instances("0xa")
+            assert mock_client.instance.get_instances.await_count == 1
+
+            await aleph_ops.list_instances("0xb")
+            assert mock_client.instance.get_instances.await_count == 2
+
+            aleph_ops._invalidate_instances("0xa")
+            await aleph_ops.list_instances("0xa")
+            assert mock_client.instance.get_instances.await_count == 3
+
+
+@pytest.mark.asyncio
+class TestSharedClient:
+    async def test_reused_across_calls(self):
+        mock_client = AsyncMock()
+        mock_client.instance = MagicMock()
+        mock_client.instance.get_instances = AsyncMock(return_value=[])
+        mock_client.__aenter__ = AsyncMock(return_value=mock_client)
+        mock_client.__aexit__ = AsyncMock(return_value=False)
+
+        with patch("aleph_agent_mcp.aleph_ops.AlephHttpClient", return_value=mock_client) as cls:
+            await aleph_ops.list_instances("0xa")
+            await aleph_ops.list_instances("0xb")
+            assert cls.call_count == 1
+            assert mock_client.__aenter__.await_count == 1
+
+            await aleph_ops.close_clients()
+            mock_client.__aexit__.assert_awaited_once()
+
+
+def test_pricing_lock_usable_across_event_loops():
+    async def fetch():
+        await asyncio.sleep(0)
+        return 1.425
+
+    async def reset():
+        aleph_ops.invalidate_pricing_cache()
+
+    with patch("aleph_agent_mcp.aleph_ops._fetch_credit_per_cu_hour", fetch):
+        _contend_in_two_loops(reset, aleph_ops.get_credit_per_cu_hour)
+
+
+def test_crn_lock_usable_across_event_loops():
+    client = _crn_client([_mock_crn("h1")])
+
+    async def get_client():
+        await asyncio.sleep(0)
+        return client
+
+    async def reset():
+        aleph_ops.invalidate_crn_cache()
+
+    with patch("aleph_agent_mcp.aleph_ops._get_client", get_client):
+        _contend_in_two_loops(reset, aleph_ops.list_crns)
+
+
+def test_client_lock_usable_across_event_loops():
+    async def enter(*_):
+        await asyncio.sleep(0)
+        return client
+
+    client = MagicMock()
+    client.__aenter__ = enter
+    client.__aexit__ = AsyncMock(return_value=False)
+    with patch("aleph_agent_mcp.aleph_ops.AlephHttpClient", return_value=client):
+        _contend_in_two_loops(aleph_ops.close_clients, aleph_ops._get_client)
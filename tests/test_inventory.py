@@ -2,8 +2,12 @@
 
 from __future__ import annotations
 
+import json
+from dataclasses import replace
 from pathlib import Path
 
+import pytest
+
 from aleph_agent_mcp import inventory
 from aleph_agent_mcp.types import VmRecord
 
@@ -22,6 +26,11 @@ class TestCrud:
         vms = inventory.load_inventory(tmp_inventory)
         assert len(vms) == 2
 
+    def test_add_many(self, tmp_inventory: Path, sample_vm: VmRecord, sample_vm_2: VmRecord):
+        inventory.add_many(tmp_inventory, [sample_vm, sample_vm_2])
+        vms = inventory.load_inventory(tmp_inventory)
+        assert [vm.item_hash for vm in vms] == ["abc123", "def456"]
+
     def test_remove(self, tmp_inventory: Path, sample_vm: VmRecord, sample_vm_2: VmRecord):
         inventory.add_vm(tmp_inventory, sample_vm)
         inventory.add_vm(tmp_inventory, sample_vm_2)
@@ -60,6 +69,104 @@ class TestCrud:
         assert inventory.load_inventory(tmp_inventory) == []
 
 
+class TestTransaction:
+    def test_batch_mutations(self, tmp_inventory: Path, sample_vm: VmRecord, sample_vm_2: VmRecord):
+        inventory.add_vm(tmp_inventory, sample_vm)
+        with inventory.inventory_transaction(tmp_inventory) as records:
+            records.append(sample_vm_2)
+            records[:] = [r for r in records if r.item_hash != "abc123"]
+        vms = inventory.load_inventory(tmp_inventory)
+        assert [vm.item_hash for vm in vms] == ["def456"]
+
+    def test_rollback_on_error(self, tmp_inventory: Path, sample_vm: VmRecord, sample_vm_2: VmRecord):
+        inventory.add_vm(tmp_inventory, sample_vm)
+        try:
+            with inventory.inventory_transaction(tmp_inventory) as records:
+                records.append(sample_vm_2)
+                raise RuntimeError
+        except RuntimeError:
+            pass
+        assert len(inventory.load_inventory(tmp_inventory)) == 1
+
+    def test_nested_write_raises(self, tmp_inventory: Path, sample_vm: VmRecord, sample_vm_2: VmRecord):
+        inventory.add_vm(tmp_inventory, sample_vm)
+        with inventory.inventory_transaction(tmp_inventory) as records:
+            assert inventory.find_vm(tmp_inventory, "abc123") == sample_vm
+            with pytest.raises(RuntimeError):
+                inventory.add_vm(tmp_inventory, sample_vm_2)
+            records.append(sample_vm_2)
+        assert len(inventory.load_inventory(tmp_inventory)) == 2
+
+
+class TestJournal:
+    def test_mutations_append_to_log(self, tmp_inventory: Path, sample_vm: VmRecord):
+        inventory.add_vm(tmp_inventory, sample_vm)
+        inventory.update_vm(tmp_inventory, "abc123", ipv4_host="5.6.7.8")
+        log = tmp_inventory.with_name(tmp_inventory.name + ".log")
+        ops = [json.loads(line)["op"] for line in log.read_text().splitlines()]
+        assert ops == ["add", "patch"]
+
+    def test_replay_from_disk(self, tmp_inventory: Path, sample_vm: VmRecord, sample_vm_2: VmRecord):
+        inventory.add_vm(tmp_inventory, sample_vm)
+        inventory.add_vm(tmp_inventory, sample_vm_2)
+        inventory.update_vm(tmp_inventory, "def456", name="renamed")
+        inventory.remove_vm(tmp_inventory, "abc123")
+
+        inventory._STATES.clear()
+        vms = inventory.load_inventory(tmp_inventory)
+        assert [(vm.item_hash, vm.name) for vm in vms] == [("def456", "renamed")]
+
+    def test_compaction(self, tmp_inventory: Path, sample_vm: VmRecord, monkeypatch):
+        monkeypatch.setattr(inventory, "_COMPACT_MIN_BYTES", 0)
+        inventory.add_vm(tmp_inventory, sample_vm)
+        log = tmp_inventory.with_name(tmp_inventory.name + ".log")
+        assert log.stat().st_size == 0
+        assert json.loads(tmp_inventory.read_text())[0]["item_hash"] == "abc123"
+
+    def test_snapshot_replaced_atomically(self, tmp_inventory: Path, sample_vm: VmRecord):
+        inventory.save_inventory(tmp_inventory, [sample_vm])
+        assert not tmp_inventory.with_name(tmp_inventory.name + ".tmp").exists()
+        assert json.loads(tmp_inventory.read_text())[0]["item_hash"] == "abc123"
+
+    def test_external_change_reloads(self, tmp_inventory: Path, sample_vm: VmRecord, sample_vm_2: VmRecord):
+        inventory.add_vm(tmp_inventory, sample_vm)
+        assert len(inventory.load_inventory(tmp_inventory)) == 1
+        tmp_inventory.write_text(json.dumps([inventory._record_to_dict(sample_vm_2)]))
+        tmp_inventory.with_name(tmp_inventory.name + ".log").write_text("")
+        vms = inventory.load_inventory(tmp_inventory)
+        assert [vm.item_hash for vm in vms] == ["def456"]
+
+    def test_rejected_patch_not_journaled(self, tmp_inventory: Path, sample_vm: VmRecord):
+        inventory.add_vm(tmp_inventory, sample_vm)
+        with pytest.raises(ValueError):
+            inventory.update_vm(tmp_inventory, "abc123", ttl_expires_at_epoch=5.0)
+        with pytest.raises(ValueError):
+            inventory.update_vm(tmp_inventory, "abc123", created_at="not a date")
+
+        inventory._STATES.clear()
+        assert inventory.find_vm(tmp_inventory, "abc123") == sample_vm
+
+    def test_append_after_torn_line(self, tmp_inventory: Path, sample_vm: VmRecord, sample_vm_2: VmRecord):
+        inventory.add_vm(tmp_inventory, sample_vm)
+        log = tmp_inventory.with_name(tmp_inventory.name + ".log")
+        with open(log, "a") as f:
+            f.write('{"op": "add", "rec')  # crash mid-append
+        inventory.add_vm(tmp_inventory, sample_vm_2)
+
+        inventory._STATES.clear()
+        vms = inventory.load_inventory(tmp_inventory)
+        assert [vm.item_hash for vm in vms] == ["abc123", "def456"]
+
+    def test_bad_op_skipped_on_replay(self, tmp_inventory: Path, sample_vm: VmRecord):
+        inventory.add_vm(tmp_inventory, sample_vm)
+        log = tmp_inventory.with_name(tmp_inventory.name + ".log")
+        with open(log, "a") as f:
+            f.write(json.dumps({"op": "patch", "item_hash": "abc123", "fields": {"bogus": 1}}) + "\n")
+
+        inventory._STATES.clear()
+        assert inventory.load_inventory(tmp_inventory) == [sample_vm]
+
+
 class TestExpiredTtls:
     def test_expired(self, tmp_inventory: Path, sample_vm: VmRecord):
         # ttl_expires_at is 2025-01-01T04:00:00 — in the past
@@ -68,11 +175,20 @@ class TestExpiredTtls:
         assert len(expired) == 1
 
     def test_no_ttl(self, tmp_inventory: Path, sample_vm: VmRecord):
-        sample_vm.ttl_expires_at = None
-        inventory.add_vm(tmp_inventory, sample_vm)
+        inventory.add_vm(tmp_inventory, replace(sample_vm, ttl_expires_at=None))
         expired = inventory.check_expired_ttls(tmp_inventory)
         assert len(expired) == 0
 
+    def test_filter_loaded_list(self, sample_vm: VmRecord, sample_vm_2: VmRecord):
+        no_ttl = replace(sample_vm_2, ttl_expires_at=None)
+        expired = inventory.filter_expired([sample_vm, no_ttl])
+        assert [vm.item_hash for vm in expired] == ["abc123"]
+
+    def test_extended_ttl_not_expired(self, tmp_inventory: Path, sample_vm: VmRecord):
+        inventory.add_vm(tmp_inventory, sample_vm)
+        inventory.update_vm(tmp_inventory, "abc123", ttl_expires_at="2999-01-01T00:00:00+00:00")
+        assert inventory.check_expired_ttls(tmp_inventory) == []
+
 
 class TestReconcile:
     def test_all_synced(self, sample_vm: VmRecord):
@@ -77,6 +77,7 @@ class TestCostThreshold:
         r = check_cost_threshold(15.0, 10.0)
         assert r.passed is False
         assert "confirmation" in r.reason.lower()
+        assert r.kind == "threshold"
 
 
 class TestRunPreCreateChecks:
@@ -110,6 +111,24 @@ class TestRunPreCreateChecks:
         )
         assert r.passed is False
         assert "TTL" in r.reason
+        assert r.kind == "ttl"
+
+    def test_concurrent_checked_before_balance(self):
+        r = run_pre_create_checks(
+            ttl_hours=4.0,
+            max_ttl_hours=24.0,
+            balance=1.0,
+            estimated_cost=5.0,
+            guard_percent=20.0,
+            active_vm_count=3,
+            max_concurrent=3,
+            session_spent=0.0,
+            max_session_spend=None,
+            cost_threshold=10.0,
+        )
+        assert r.passed is False
+        assert "concurrent" in r.reason
+        assert r.kind == "concurrent"
 
     def test_threshold_bypassed_when_confirmed(self):
         r = run_pre_create_checks(
@@ -143,3 +162,4 @@ class TestRunPreCreateChecks:
         )
         assert r.passed is False
         assert "confirmation" in r.reason.lower()
+        assert r.kind == "threshold"
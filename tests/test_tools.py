@@ -2,9 +2,13 @@
 
 from __future__ import annotations
 
+import asyncio
+import os
+from dataclasses import asdict
 from datetime import datetime, timedelta, timezone
 from pathlib import Path
-from unittest.mock import AsyncMock, patch, MagicMock
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, patch
 
 import pytest
 
@@ -12,56 +16,166 @@ from aleph_agent_mcp import server
 from aleph_agent_mcp.types import CrnInfo, VmRecord
 
 
+FIXED_NOW = datetime(2025, 6, 1, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def frozen_now():
+    """Pin server._now() to FIXED_NOW."""
+    with patch.object(server, "_now", return_value=FIXED_NOW):
+        yield FIXED_NOW
+
+
 @pytest.fixture(autouse=True)
 def reset_session_state():
     """Reset server session state between tests."""
-    server._session_spend = 0.0
-    server._orphan_check_done = False
-    server._credit_per_cu_hour = None
+    server._reset_session()
     yield
 
 
+@pytest.fixture(scope="session")
+def _session_keys(tmp_path_factory) -> Path:
+    """Read-only key material shared by every test."""
+    root = tmp_path_factory.mktemp("keys")
+    (root / "id_ed25519.pub").write_text("ssh-ed25519 AAAA testkey")
+    (root / "ethereum.key").write_text("0x" + "ab" * 32)
+    return root
+
+
 @pytest.fixture(autouse=True)
-def mock_settings(tmp_path: Path):
+def mock_settings(tmp_path: Path, _session_keys: Path):
     """Override settings to use temp paths."""
     inv_path = tmp_path / "inventory.json"
-    ssh_path = tmp_path / "id_ed25519.pub"
-    ssh_path.write_text("ssh-ed25519 AAAA testkey")
-    key_path = tmp_path / "ethereum.key"
-    key_path.write_text("0x" + "ab" * 32)
-
-    with patch.object(server.settings, "inventory_path", inv_path), \
-         patch.object(server.settings, "ssh_pubkey_path", ssh_path), \
-         patch.object(server.settings, "private_key_path", key_path), \
-         patch.object(server.settings, "human_address", None), \
-         patch.object(server.settings, "max_concurrent_vms", 3), \
-         patch.object(server.settings, "default_ttl_hours", 4.0), \
-         patch.object(server.settings, "max_ttl_hours", 24.0), \
-         patch.object(server.settings, "balance_guard_percent", 20.0), \
-         patch.object(server.settings, "cost_threshold", 10.0), \
-         patch.object(server.settings, "max_session_spend", None):
+    ssh_path = _session_keys / "id_ed25519.pub"
+    key_path = _session_keys / "ethereum.key"
+
+    original = server.settings
+    server.settings = SimpleNamespace(
+        inventory_path=inv_path,
+        ssh_pubkey_path=ssh_path,
+        private_key_path=key_path,
+        human_address=None,
+        max_concurrent_vms=3,
+        default_ttl_hours=4.0,
+        max_ttl_hours=24.0,
+        balance_guard_percent=20.0,
+        cost_threshold=10.0,
+        max_session_spend=None,
+    )
+    try:
         yield inv_path
+    finally:
+        server.settings = original
+
+
+def _coro(value):
+    """Cheap async stand-in for AsyncMock where no call assertions are made."""
+    async def f(*args, **kwargs):
+        return value
+    return f
 
 
-def _mock_account():
-    acc = MagicMock()
-    acc.get_address.return_value = "0xagent"
-    return acc
+class _FakeAccount:
+    """Minimal account stub; handlers only call get_address()."""
+
+    __slots__ = ()
+
+    @staticmethod
+    def get_address() -> str:
+        return "0xagent"
+
+
+_FAKE_ACCOUNT = _FakeAccount()
 
 
 @pytest.mark.asyncio
 class TestCheckBalance:
     async def test_basic(self, mock_settings):
-        with patch.object(server, "_account", return_value=_mock_account()), \
-             patch.object(server.aleph_ops, "get_balance", new_callable=AsyncMock, return_value=500.0), \
-             patch.object(server.aleph_ops, "get_credit_per_cu_hour", new_callable=AsyncMock, return_value=1.425), \
-             patch.object(server.aleph_ops, "list_instances", new_callable=AsyncMock, return_value=set()):
+        with patch.object(server, "_account", return_value=_FAKE_ACCOUNT), \
+             patch.object(server.aleph_ops, "get_balance", _coro(500.0)), \
+             patch.object(server.aleph_ops, "get_credit_per_cu_hour", _coro(1.425)), \
+             patch.object(server.aleph_ops, "list_instances", _coro(set())):
             result = await server._check_balance()
             assert result["balance_credits"] == 500.0
             assert result["active_vm_count"] == 0
             assert result["burn_rate_per_hour"] == 0.0
             assert result["runway_hours"] is None
 
+    async def test_orphan_check_retried_after_balance_failure(self, mock_settings):
+        balance = AsyncMock(side_effect=[RuntimeError("down"), 500.0])
+        with patch.object(server, "_account", return_value=_FAKE_ACCOUNT), \
+             patch.object(server.aleph_ops, "get_balance", balance), \
+             patch.object(server.aleph_ops, "get_credit_per_cu_hour", _coro(1.425)), \
+             patch.object(server.aleph_ops, "list_instances", _coro({"orphan1"})):
+            with pytest.raises(RuntimeError):
+                await server._check_balance()
+            result = await server._check_balance()
+            assert "orphan1" in result["warnings"][0]
+
+    async def test_orphan_detection_failure_is_a_warning(self, mock_settings):
+        with patch.object(server, "_account", return_value=_FAKE_ACCOUNT), \
+             patch.object(server.aleph_ops, "get_balance", _coro(500.0)), \
+             patch.object(server.aleph_ops, "get_credit_per_cu_hour", _coro(1.425)), \
+             patch.object(server.aleph_ops, "list_instances", new_callable=AsyncMock, side_effect=RuntimeError("down")):
+            result = await server._check_balance()
+            assert result["balance_credits"] == 500.0
+            assert any("Orphan detection failed" in w for w in result["warnings"])
+
+
+class TestKeyFileCache:
+    def test_ssh_pubkey_reread_on_change(self, tmp_path):
+        # Use a private copy; the session key files must stay unchanged
+        path = tmp_path / "id_ed25519.pub"
+        path.write_text("ssh-ed25519 AAAA testkey")
+        server.settings.ssh_pubkey_path = path
+        assert server._ssh_pubkey() == "ssh-ed25519 AAAA testkey"
+        path.write_text("ssh-ed25519 BBBB newkey\n")
+        os.utime(path, ns=(0, path.stat().st_mtime_ns + 1_000_000))
+        assert server._ssh_pubkey() == "ssh-ed25519 BBBB newkey"
+
+    def test_account_loaded_once(self, mock_settings):
+        with patch.object(server, "load_account", return_value=_FAKE_ACCOUNT) as load:
+            server._load_account_cached.cache_clear()
+            assert server._account() is server._account()
+            assert load.call_count == 1
+
+    def test_missing_key_file_uses_sdk_fallback(self, tmp_path):
+        missing = tmp_path / "absent.key"
+        server.settings.private_key_path = missing
+        with patch.object(server, "load_account", return_value=_FAKE_ACCOUNT) as load:
+            assert server._account() is _FAKE_ACCOUNT
+            load.assert_called_once_with(missing)
+
+
+@pytest.mark.asyncio
+class TestGetPrice:
+    async def test_concurrent_callers_share_fetch(self):
+        with patch.object(server.aleph_ops, "get_credit_per_cu_hour", new_callable=AsyncMock, return_value=1.425) as fetch:
+            prices = await asyncio.gather(*(server._get_price() for _ in range(5)))
+            assert prices == [1.425] * 5
+            assert fetch.await_count == 1
+
+    async def test_refetches_after_ttl(self):
+        with patch.object(server.aleph_ops, "get_credit_per_cu_hour", new_callable=AsyncMock, return_value=1.425) as fetch:
+            await server._get_price()
+            server._credit_per_cu_hour = (0.0, 1.425)  # force expiry
+            await server._get_price()
+            assert fetch.await_count == 2
+
+
+def test_price_lock_usable_across_event_loops():
+    async def slow_fetch():
+        await asyncio.sleep(0)
+        return 1.425
+
+    async def contend():
+        return await asyncio.gather(*(server._get_price() for _ in range(3)))
+
+    with patch.object(server.aleph_ops, "get_credit_per_cu_hour", slow_fetch):
+        for _ in range(2):
+            server._reset_session()
+            assert asyncio.run(contend()) == [1.425] * 3
+
 
 @pytest.mark.asyncio
 class TestListCrns:
@@ -70,28 +184,25 @@ class TestListCrns:
             CrnInfo(hash="h1", name="CRN-1", url="https://crn1.example.com", score=0.9),
             CrnInfo(hash="h2", name="CRN-2", url="https://crn2.example.com", score=0.8, has_gpu=True),
         ]
-        with patch.object(server.aleph_ops, "list_crns", new_callable=AsyncMock, return_value=crns):
+        with patch.object(server.aleph_ops, "list_crns", _coro(crns)):
             result = await server._list_crns()
             assert len(result) == 2
             assert result[0]["hash"] == "h1"
 
-    async def test_gpu_filter(self):
-        crns = [
-            CrnInfo(hash="h1", name="CRN-1", url="u", score=0.9, has_gpu=False),
-            CrnInfo(hash="h2", name="CRN-2", url="u", score=0.8, has_gpu=True),
-        ]
-        with patch.object(server.aleph_ops, "list_crns", new_callable=AsyncMock, return_value=crns):
+    async def test_gpu_filter_delegated(self):
+        crns = [CrnInfo(hash="h2", name="CRN-2", url="u", score=0.8, has_gpu=True)]
+        with patch.object(server.aleph_ops, "list_crns", new_callable=AsyncMock, return_value=crns) as m:
             result = await server._list_crns(gpu=True)
-            assert len(result) == 1
-            assert result[0]["hash"] == "h2"
+            m.assert_awaited_once_with(min_compute_units=1, gpu=True)
+            assert [c["hash"] for c in result] == ["h2"]
 
 
 @pytest.mark.asyncio
 class TestCreateVm:
     async def test_dry_run(self, mock_settings):
-        with patch.object(server, "_account", return_value=_mock_account()), \
-             patch.object(server.aleph_ops, "get_balance", new_callable=AsyncMock, return_value=500.0), \
-             patch.object(server.aleph_ops, "get_credit_per_cu_hour", new_callable=AsyncMock, return_value=1.425):
+        with patch.object(server, "_account", return_value=_FAKE_ACCOUNT), \
+             patch.object(server.aleph_ops, "get_balance", _coro(500.0)), \
+             patch.object(server.aleph_ops, "get_credit_per_cu_hour", _coro(1.425)):
             result = await server._create_vm(
                 name="test", crn_hash="crn1", dry_run=True
             )
@@ -103,29 +214,43 @@ class TestCreateVm:
     async def test_concurrent_limit(self, mock_settings):
         from aleph_agent_mcp import inventory
         # Add 3 VMs to hit the limit
-        for i in range(3):
-            inventory.add_vm(mock_settings, VmRecord(
+        inventory.add_many(mock_settings, [
+            VmRecord(
                 item_hash=f"vm{i}", name=f"vm-{i}", crn_hash="c", crn_url="u",
                 compute_units=1, created_at="2099-01-01T00:00:00+00:00",
                 ttl_expires_at="2099-01-01T04:00:00+00:00", hourly_cost=1.425,
-            ))
+            )
+            for i in range(3)
+        ])
 
-        with patch.object(server, "_account", return_value=_mock_account()), \
-             patch.object(server.aleph_ops, "get_balance", new_callable=AsyncMock, return_value=500.0), \
-             patch.object(server.aleph_ops, "get_credit_per_cu_hour", new_callable=AsyncMock, return_value=1.425):
+        with patch.object(server, "_account", return_value=_FAKE_ACCOUNT), \
+             patch.object(server.aleph_ops, "get_balance", _coro(500.0)), \
+             patch.object(server.aleph_ops, "get_credit_per_cu_hour", _coro(1.425)), \
+             patch.object(server.aleph_ops, "find_crn", _coro(None)):
             result = await server._create_vm(name="test", crn_hash="crn1")
             assert "error" in result
             assert "concurrent" in result["error"].lower()
 
     async def test_balance_guard(self, mock_settings):
-        with patch.object(server, "_account", return_value=_mock_account()), \
-             patch.object(server.aleph_ops, "get_balance", new_callable=AsyncMock, return_value=6.0), \
-             patch.object(server.aleph_ops, "get_credit_per_cu_hour", new_callable=AsyncMock, return_value=1.425):
+        with patch.object(server, "_account", return_value=_FAKE_ACCOUNT), \
+             patch.object(server.aleph_ops, "get_balance", _coro(6.0)), \
+             patch.object(server.aleph_ops, "get_credit_per_cu_hour", _coro(1.425)), \
+             patch.object(server.aleph_ops, "find_crn", _coro(None)):
             # 1 CU * 4h = 5.7 credits, balance=6, guard=20% → floor=1.2, remaining=0.3 → fail
             result = await server._create_vm(name="test", crn_hash="crn1")
             assert "error" in result
             assert "guard" in result["error"].lower()
 
+    async def test_missing_crn_releases_session_spend(self, mock_settings):
+        with patch.object(server, "_account", return_value=_FAKE_ACCOUNT), \
+             patch.object(server.settings, "max_session_spend", 10.0), \
+             patch.object(server.aleph_ops, "get_balance", _coro(500.0)), \
+             patch.object(server.aleph_ops, "get_credit_per_cu_hour", _coro(1.425)), \
+             patch.object(server.aleph_ops, "find_crn", _coro(None)):
+            result = await server._create_vm(name="test", crn_hash="crn1")
+            assert "not found" in result["error"]
+            assert server._state.spend == 0.0
+
 
 @pytest.mark.asyncio
 class TestDestroyVm:
@@ -133,9 +258,9 @@ class TestDestroyVm:
         result = await server._destroy_vm(item_hash="nonexistent")
         assert "error" in result
 
-    async def test_success(self, mock_settings):
+    async def test_success(self, mock_settings, frozen_now):
         from aleph_agent_mcp import inventory
-        now = datetime.now(timezone.utc)
+        now = frozen_now
         vm = VmRecord(
             item_hash="vm1", name="test", crn_hash="c",
             crn_url="https://crn.example.com",
@@ -145,14 +270,60 @@ class TestDestroyVm:
         )
         inventory.add_vm(mock_settings, vm)
 
-        with patch.object(server, "_account", return_value=_mock_account()), \
-             patch.object(server.aleph_ops, "destroy_instance", new_callable=AsyncMock):
+        with patch.object(server, "_account", return_value=_FAKE_ACCOUNT), \
+             patch.object(server.aleph_ops, "destroy_instance", _coro(None)):
             result = await server._destroy_vm(item_hash="vm1")
             assert result["status"] == "destroyed"
-            assert result["runtime_minutes"] > 0
+            assert result["runtime_minutes"] == 60.0
             # Should be removed from inventory
             assert inventory.find_vm(mock_settings, "vm1") is None
 
+    async def test_key_mismatch(self, mock_settings):
+        from aleph_agent_mcp import inventory
+        inventory.add_vm(mock_settings, VmRecord(
+            item_hash="vm1", name="test", crn_hash="c", crn_url="u",
+            compute_units=1, created_at="2099-01-01T00:00:00+00:00",
+            ttl_expires_at=None, hourly_cost=1.425, signing_address="0xOTHER",
+        ))
+
+        with patch.object(server, "_account", return_value=_FAKE_ACCOUNT), \
+             patch.object(server.aleph_ops, "destroy_instance", new_callable=AsyncMock) as destroy:
+            result = await server._destroy_vm(item_hash="vm1")
+            assert "Key mismatch" in result["error"]
+            destroy.assert_not_awaited()
+
+
+@pytest.mark.asyncio
+class TestListMyVms:
+    async def test_statuses(self, mock_settings):
+        from aleph_agent_mcp import inventory
+        for item_hash, ttl in [
+            ("running", "2099-01-01T04:00:00+00:00"),
+            ("expired", "2000-01-01T04:00:00+00:00"),
+            ("stale", "2099-01-01T04:00:00+00:00"),
+        ]:
+            inventory.add_vm(mock_settings, VmRecord(
+                item_hash=item_hash, name=item_hash, crn_hash="c", crn_url="u",
+                compute_units=1, created_at="2000-01-01T00:00:00+00:00",
+                ttl_expires_at=ttl, hourly_cost=1.425,
+            ))
+
+        with patch.object(server, "_account", return_value=_FAKE_ACCOUNT), \
+             patch.object(server.aleph_ops, "get_credit_per_cu_hour", _coro(1.425)), \
+             patch.object(server.aleph_ops, "list_instances", _coro({"running", "expired", "orphan1"})):
+            result = await server._list_my_vms()
+
+        statuses = {r["item_hash"]: r["status"] for r in result}
+        assert statuses == {
+            "running": "running",
+            "expired": "expired",
+            "stale": "stale",
+            "orphan1": "orphan",
+        }
+        expired = next(r for r in result if r["item_hash"] == "expired")
+        assert expired["expired"] is True
+        assert expired["cost_so_far"] > 0
+
 
 @pytest.mark.asyncio
 class TestExtendVm:
@@ -160,9 +331,9 @@ class TestExtendVm:
         result = await server._extend_vm(item_hash="nope", additional_hours=2.0)
         assert "error" in result
 
-    async def test_success(self, mock_settings):
+    async def test_success(self, mock_settings, frozen_now):
         from aleph_agent_mcp import inventory
-        now = datetime.now(timezone.utc)
+        now = frozen_now
         vm = VmRecord(
             item_hash="vm1", name="test", crn_hash="c",
             crn_url="https://crn.example.com",
@@ -172,9 +343,94 @@ class TestExtendVm:
         )
         inventory.add_vm(mock_settings, vm)
 
-        with patch.object(server, "_account", return_value=_mock_account()), \
-             patch.object(server.aleph_ops, "get_balance", new_callable=AsyncMock, return_value=500.0), \
-             patch.object(server.aleph_ops, "get_credit_per_cu_hour", new_callable=AsyncMock, return_value=1.425):
+        with patch.object(server, "_account", return_value=_FAKE_ACCOUNT), \
+             patch.object(server.aleph_ops, "get_balance", _coro(500.0)), \
+             patch.object(server.aleph_ops, "get_credit_per_cu_hour", _coro(1.425)):
             result = await server._extend_vm(item_hash="vm1", additional_hours=2.0)
             assert "new_ttl_expires_at" in result
             assert result["additional_cost_estimate"] == 2.85
+            new_expiry = datetime.fromisoformat(result["new_ttl_expires_at"])
+            assert new_expiry == now + timedelta(hours=4)
+            assert inventory.find_vm(mock_settings, "vm1").ttl_expires_at == result["new_ttl_expires_at"]
+
+    async def test_concurrent_extends_stack(self, mock_settings, frozen_now):
+        from aleph_agent_mcp import inventory
+        now = frozen_now
+        inventory.add_vm(mock_settings, VmRecord(
+            item_hash="vm1", name="test", crn_hash="c", crn_url="u",
+            compute_units=1, created_at=now.isoformat(),
+            ttl_expires_at=(now + timedelta(hours=2)).isoformat(),
+            hourly_cost=1.425,
+        ))
+
+        with patch.object(server, "_account", return_value=_FAKE_ACCOUNT), \
+             patch.object(server.aleph_ops, "get_balance", _coro(500.0)), \
+             patch.object(server.aleph_ops, "get_credit_per_cu_hour", _coro(1.425)):
+            await asyncio.gather(
+                server._extend_vm(item_hash="vm1", additional_hours=2.0),
+                server._extend_vm(item_hash="vm1", additional_hours=2.0),
+            )
+        record = inventory.find_vm(mock_settings, "vm1")
+        assert datetime.fromisoformat(record.ttl_expires_at) == now + timedelta(hours=6)
+        assert server._state.spend == pytest.approx(5.7)
+
+
+@pytest.mark.asyncio
+class TestBatch:
+    async def test_runs_ops_in_order(self):
+        crns = [CrnInfo(hash="h1", name="CRN-1", url="u", score=0.9)]
+        with patch.object(server.aleph_ops, "list_crns", _coro(crns)):
+            result = await server._batch([
+                {"tool": "aleph_list_crns"},
+                {"tool": "aleph_destroy_vm", "args": {"item_hash": "nope"}},
+                {"tool": "aleph_nope"},
+            ])
+        assert result[0] == {"tool": "aleph_list_crns", "result": [asdict(crns[0])]}
+        assert "not found" in result[1]["error"]
+        assert "Unknown tool" in result[2]["error"]
+
+    async def test_stop_on_error_skips_remaining(self):
+        result = await server._batch(
+            [
+                {"tool": "aleph_destroy_vm", "args": {"item_hash": "nope"}},
+                {"tool": "aleph_extend_vm", "args": {"item_hash": "nope", "additional_hours": 1}},
+            ],
+            max_concurrent=1,
+            stop_on_error=True,
+        )
+        assert "not found" in result[0]["error"]
+        assert result[1]["error"].startswith("Skipped")
+
+    async def test_creates_respect_concurrent_limit(self, mock_settings):
+        from aleph_agent_mcp import inventory
+        crn = CrnInfo(hash="crn1", name="CRN-1", url="https://crn1.example.com", score=0.9)
+        create = AsyncMock(side_effect=[(f"vm{i}", None, None, None) for i in range(4)])
+        with patch.object(server, "_account", return_value=_FAKE_ACCOUNT), \
+             patch.object(server.settings, "max_concurrent_vms", 2), \
+             patch.object(server.aleph_ops, "get_balance", _coro(500.0)), \
+             patch.object(server.aleph_ops, "get_credit_per_cu_hour", _coro(1.425)), \
+             patch.object(server.aleph_ops, "find_crn", _coro(crn)), \
+             patch.object(server.aleph_ops, "create_instance", create):
+            result = await server._batch([
+                {"tool": "aleph_create_vm", "args": {"name": f"vm-{i}", "crn_hash": "crn1"}}
+                for i in range(4)
+            ])
+        assert [("error" in r) for r in result] == [False, False, True, True]
+        assert "concurrent" in result[2]["error"]
+        assert len(inventory.load_inventory(mock_settings)) == 2
+
+    async def test_bad_args_reported(self):
+        result = await server._batch([{"tool": "aleph_destroy_vm", "args": {"bogus": 1}}])
+        assert result[0]["error"].startswith("Invalid arguments")
+
+    async def test_string_confirmed_does_not_bypass_threshold(self, mock_settings):
+        with patch.object(server, "_account", return_value=_FAKE_ACCOUNT), \
+             patch.object(server.aleph_ops, "get_balance", _coro(500.0)), \
+             patch.object(server.aleph_ops, "get_credit_per_cu_hour", _coro(1.425)), \
+             patch.object(server.aleph_ops, "find_crn", _coro(None)):
+            result = await server._batch([{
+                "tool": "aleph_create_vm",
+                "args": {"name": "big", "crn_hash": "crn1", "compute_units": 3,
+                         "ttl_hours": 8, "confirmed": "false"},
+            }])
+        assert result[0]["result"]["requires_confirmation"] is True